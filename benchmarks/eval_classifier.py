@@ -0,0 +1,88 @@
+"""
+Offline evaluation of the local news classifier against LLM category labels.
+
+Input is a JSONL file of {"title": ..., "category": ...} records, where category is the
+LLM label. Records without a label can be labelled first with --label (needs OPENAI_API_KEY);
+the labels are written back to the file so later runs are fully offline.
+
+    python benchmarks/eval_classifier.py titles.jsonl --label
+    python benchmarks/eval_classifier.py titles.jsonl --thresholds 0.6 0.7 0.75 0.8 0.9
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.news_classifier import NewsClassifier
+
+def load_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def label_records(records, path):
+    from utils.ai_analyzer import AIAnalyzer
+    from utils.llm_scheduler import PRIORITY_BACKGROUND
+
+    analyzer = AIAnalyzer()
+    for record in records:
+        if not record.get('category'):
+            record['category'] = analyzer.categorize_news_llm(record['title'], PRIORITY_BACKGROUND)['category']
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+def evaluate(records, thresholds):
+    classifier = NewsClassifier()
+    labelled = [record for record in records if record.get('category')]
+
+    start = time.perf_counter()
+    predictions = [classifier.classify(record['title']) for record in labelled]
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'articles': len(labelled),
+        'mean_classify_us': elapsed / max(len(labelled), 1) * 1e6,
+        'overall_agreement': sum(
+            prediction['category'] == record['category'] for prediction, record in zip(predictions, labelled)
+        ) / max(len(labelled), 1),
+        'thresholds': [],
+        'confusion': Counter(
+            f"{record['category']} -> {prediction['category']}" for prediction, record in zip(predictions, labelled)
+        ),
+    }
+
+    for threshold in thresholds:
+        confident = [
+            (prediction, record) for prediction, record in zip(predictions, labelled)
+            if prediction['confidence'] >= threshold
+        ]
+        report['thresholds'].append({
+            'threshold': threshold,
+            # Share of titles handled locally, and how often those agree with the LLM
+            'coverage': len(confident) / max(len(labelled), 1),
+            'agreement': sum(
+                prediction['category'] == record['category'] for prediction, record in confident
+            ) / max(len(confident), 1),
+        })
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='JSONL file of titles with LLM category labels')
+    parser.add_argument('--label', action='store_true', help='label unlabelled titles with the LLM first')
+    parser.add_argument('--thresholds', type=float, nargs='+',
+                        default=[0.5, 0.6, 0.7, NewsClassifier().threshold, 0.8, 0.9])
+    args = parser.parse_args()
+
+    records = load_records(args.path)
+    if args.label:
+        label_records(records, args.path)
+
+    print(json.dumps(evaluate(records, sorted(set(args.thresholds))), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Offline comparison of model tiers for sentiment scoring and news categorization.
+
+Every article is scored by each model on its own (no escalation), and once more with the
+analyzer's routing, where the small model's invalid or low-confidence answers are re-asked
+of the escalation model. Results are compared with a reference model's answers, alongside
+latency, tokens and estimated cost per tier, so a cheaper routing can be shown not to
+degrade quality. Nothing is read from or written to the analysis cache.
+
+Input is a JSONL file of {"title": ..., "description": ...} articles, which can be exported
+from the news store first with --export.
+
+    python benchmarks/eval_models.py articles.jsonl --export "Apple" "Microsoft"
+    python benchmarks/eval_models.py articles.jsonl --models gpt-4o-mini gpt-4 --reference gpt-4
+    python benchmarks/eval_models.py articles.jsonl --fake
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.load import git_commit
+from utils.ai_analyzer import AIAnalyzer, CATEGORY_PROMPT, SENTIMENT_PROMPT
+from utils.llm_scheduler import PRIORITY_BACKGROUND
+
+# USD per million (input, output) tokens; override with --price MODEL INPUT OUTPUT
+PRICES = {
+    'gpt-4': (30.0, 60.0),
+    'gpt-4-turbo': (10.0, 30.0),
+    'gpt-4o': (2.5, 10.0),
+    'gpt-4o-mini': (0.15, 0.6),
+    'gpt-3.5-turbo': (0.5, 1.5),
+}
+
+TASK_PROMPTS = {SENTIMENT_PROMPT: 'sentiment', CATEGORY_PROMPT: 'category'}
+
+class NullCache:
+    """
+    Analysis cache that never hits, so every article reaches the model
+    """
+
+    make_key = staticmethod(lambda model, prompt, text: None)
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+class RecordingClient:
+    """
+    Wraps an OpenAI-compatible client and records model, task, latency and usage of each call
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+        self.lock = threading.Lock()
+        self.chat = self
+        self.completions = self
+
+    def create(self, model, messages, **kwargs):
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(response, 'usage', None)
+        with self.lock:
+            self.calls.append({
+                'model': model,
+                'task': TASK_PROMPTS.get(messages[0]['content'], 'other'),
+                'seconds': time.perf_counter() - start,
+                'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+                'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+            })
+        return response
+
+    def reset(self):
+        with self.lock:
+            calls, self.calls = self.calls, []
+        return calls
+
+def load_articles(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def export_articles(path, companies, limit):
+    from utils.news_store import NewsStore
+
+    store = NewsStore()
+    seen = set()
+    with open(path, 'w') as f:
+        for company in companies:
+            for article in store.latest(company, limit):
+                if article['title'] in seen:
+                    continue
+                seen.add(article['title'])
+                f.write(json.dumps({'title': article['title'], 'description': article['description']}) + '\n')
+    print(f"Exported {len(seen)} articles to {path}")
+
+def run_tier(client, articles, models, escalation_model):
+    """
+    Score every article with one model configuration; returns (answers, recorded calls)
+    """
+    analyzer = AIAnalyzer(cache=NullCache(), client=client, models=models, escalation_model=escalation_model)
+    client.reset()
+    answers = [
+        {
+            'sentiment': analyzer.analyze_sentiment(article.get('description') or article['title'], PRIORITY_BACKGROUND),
+            'category': analyzer.categorize_news_llm(article['title'], PRIORITY_BACKGROUND)['category'],
+        }
+        for article in articles
+    ]
+    return answers, client.reset()
+
+def cost(calls, prices):
+    total = 0.0
+    for call in calls:
+        price = prices.get(call['model'])
+        if price is None:
+            return None
+        total += (call['prompt_tokens'] * price[0] + call['completion_tokens'] * price[1]) / 1e6
+    return total
+
+def summarize(name, answers, calls, reference, articles, prices, escalation_model=None):
+    latencies = sorted(call['seconds'] for call in calls)
+    ratings = [(answer['sentiment']['rating'], expected['sentiment']['rating'])
+               for answer, expected in zip(answers, reference)]
+    result = {
+        'tier': name,
+        'calls': len(calls),
+        'p50_ms': round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        'p95_ms': round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1) if latencies else None,
+        'prompt_tokens': sum(call['prompt_tokens'] for call in calls),
+        'completion_tokens': sum(call['completion_tokens'] for call in calls),
+        'cost_usd': cost(calls, prices),
+        'category_agreement': sum(
+            answer['category'] == expected['category'] for answer, expected in zip(answers, reference)
+        ) / max(len(articles), 1),
+        'rating_mae': sum(abs(a - b) for a, b in ratings) / max(len(ratings), 1),
+        'rating_within_1': sum(abs(a - b) <= 1 for a, b in ratings) / max(len(ratings), 1),
+    }
+    if escalation_model is not None:
+        # Share of articles whose small-model answer was re-asked of the escalation model
+        for task in ('sentiment', 'category'):
+            escalated = sum(1 for call in calls if call['task'] == task and call['model'] == escalation_model)
+            result[f'{task}_escalation_rate'] = escalated / max(len(articles), 1)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='JSONL file of articles')
+    parser.add_argument('--export', nargs='+', metavar='COMPANY',
+                        help='first write the latest stored articles for these companies to path')
+    parser.add_argument('--limit', type=int, default=50, help='articles per company with --export')
+    parser.add_argument('--models', nargs='+', help='single-model tiers to compare (default: small and large model)')
+    parser.add_argument('--reference', help='model whose answers count as correct (default: AI_MODEL)')
+    parser.add_argument('--price', nargs=3, action='append', default=[], metavar=('MODEL', 'INPUT', 'OUTPUT'),
+                        help='USD per million input and output tokens')
+    parser.add_argument('--fake', action='store_true', help='use the offline OpenAI fake (dry run)')
+    parser.add_argument('--output', help='results file (default benchmarks/results/models-<timestamp>-<commit>.json)')
+    args = parser.parse_args()
+
+    if args.export:
+        export_articles(args.path, args.export, args.limit)
+    articles = load_articles(args.path)
+    if not articles:
+        sys.exit(f"No articles in {args.path}")
+
+    prices = dict(PRICES)
+    for model, input_price, output_price in args.price:
+        prices[model] = (float(input_price), float(output_price))
+
+    if args.fake:
+        from benchmarks.fakes import FakeOpenAI
+        client = RecordingClient(FakeOpenAI(mean_latency=0.01, seed=1))
+    else:
+        client = RecordingClient(AIAnalyzer().client)
+
+    routed = AIAnalyzer(cache=NullCache(), client=client)
+    reference_model = args.reference or routed.model
+    tiers = args.models or sorted({routed.models['sentiment'], routed.models['category'], routed.escalation_model})
+
+    reference, _ = run_tier(client, articles, {'sentiment': reference_model, 'category': reference_model},
+                            reference_model)
+    results = []
+    for model in tiers:
+        answers, calls = run_tier(client, articles, {'sentiment': model, 'category': model}, model)
+        results.append(summarize(model, answers, calls, reference, articles, prices))
+
+    answers, calls = run_tier(client, articles, None, None)
+    results.append(summarize('routed', answers, calls, reference, articles, prices, routed.escalation_model))
+
+    for result in results:
+        cost_usd = f"${result['cost_usd']:.4f}" if result['cost_usd'] is not None else 'n/a'
+        print(f"{result['tier']:<16} p50 {result['p50_ms']} ms  cost {cost_usd}  "
+              f"category {result['category_agreement']:.1%}  rating MAE {result['rating_mae']:.2f}")
+
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"models-{timestamp}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': timestamp,
+            'articles': len(articles),
+            'reference': reference_model,
+            'routing': dict(routed.models, escalation=routed.escalation_model,
+                            escalation_confidence=routed.escalation_confidence),
+            'fake': args.fake,
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Local stand-ins for the OpenAI, NewsAPI and yfinance clients.
+
+Each fake replays responses from benchmarks/fixtures in the shape the real client returns,
+after sleeping for a configurable latency, and raises on a configurable share of calls.
+Inject them through the client / quote_source constructor arguments of AIAnalyzer,
+NewsFetcher and StockFetcher.
+"""
+import os
+import re
+import json
+import time
+import random
+import zlib
+import threading
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+class FakeUpstreamError(Exception):
+    pass
+
+class FakeUpstream:
+    """
+    Shared latency and error injection: latency is lognormal around mean_latency seconds
+    """
+
+    def __init__(self, name, mean_latency=0.1, jitter=0.3, error_rate=0.0, seed=None):
+        self.name = name
+        self.mean_latency = mean_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def wait(self):
+        with self.lock:
+            self.calls += 1
+            delay = self.mean_latency * self.random.lognormvariate(0, self.jitter) if self.mean_latency else 0
+            failed = self.random.random() < self.error_rate
+        time.sleep(delay)
+        if failed:
+            raise FakeUpstreamError(f"Injected {self.name} failure")
+
+class FakeOpenAI(FakeUpstream):
+    """
+    Replacement for openai.OpenAI exposing chat.completions.create()
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__('openai', **kwargs)
+        self.responses = load_fixture('openai_responses.json')
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, stream=False, response_format=None, **kwargs):
+        self.wait()
+        system, user = messages[0]['content'], messages[-1]['content']
+        index = zlib.crc32(user.encode('utf-8'))
+
+        if response_format is None:
+            content = self._pick(self.responses['summaries'], index)
+        elif "'articles'" in system:
+            content = json.dumps({'articles': [
+                {
+                    'id': article['id'],
+                    'summary': self._pick(self.responses['summaries'], index + article['id']),
+                    'sentiment': self._pick(self.responses['sentiments'], index + article['id']),
+                    'category': self._pick(self.responses['categories'], index + article['id'])
+                }
+                for article in json.loads(user)
+            ]})
+        elif "'category'" in system:
+            content = json.dumps({'category': self._pick(self.responses['categories'], index)})
+        else:
+            content = json.dumps(self._pick(self.responses['sentiments'], index))
+
+        usage = SimpleNamespace(**self.responses['usage'])
+        if stream:
+            return self._stream(content, usage)
+        message = SimpleNamespace(role='assistant', content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    @staticmethod
+    def _pick(options, index):
+        return options[index % len(options)]
+
+    def _stream(self, content, usage):
+        for token in re.findall(r'\S+\s*', content):
+            time.sleep(0.002)
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+class FakeNewsApi(FakeUpstream):
+    """
+    Replacement for newsapi.NewsApiClient exposing get_everything()
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__('newsapi', **kwargs)
+        self.response = load_fixture('newsapi_everything.json')
+
+    def get_everything(self, q=None, page_size=20, **kwargs):
+        self.wait()
+        slug = re.sub(r'[^a-z0-9]+', '-', (q or '').lower()).strip('-')
+        now = datetime.now(timezone.utc)
+        articles = []
+        for offset, article in enumerate(self.response['articles'][:page_size]):
+            article = json.loads(
+                json.dumps(article).replace('{company}', q or '').replace('{slug}', slug)
+            )
+            # Keep replayed articles inside the fetcher's 7-day window
+            published = now - timedelta(hours=6 * offset + 1)
+            article['publishedAt'] = published.strftime('%Y-%m-%dT%H:%M:%SZ')
+            articles.append(article)
+        return {'status': 'ok', 'totalResults': len(articles), 'articles': articles}
+
+class FakeYFinance(FakeUpstream):
+    """
+    Replacement for the yfinance module exposing Ticker() and download()
+    """
+
+    PERIOD_DAYS = {'1d': 1, '5d': 5, '1mo': 30, '3mo': 90, '6mo': 180, '1y': 365, '2y': 730,
+                   '5y': 1825, '10y': 3650, 'ytd': 365, 'max': 7300}
+
+    def __init__(self, **kwargs):
+        super().__init__('yfinance', **kwargs)
+        self.info = load_fixture('yfinance_info.json')
+
+    def history_frame(self, symbol, period='1mo'):
+        """
+        Deterministic random-walk OHLCV history for a symbol
+        """
+        import numpy as np
+        import pandas as pd
+
+        days = self.PERIOD_DAYS.get(period, 30)
+        rng = np.random.default_rng(zlib.crc32(symbol.encode('utf-8')))
+        index = pd.bdate_range(end=pd.Timestamp.now(tz='America/New_York').normalize(), periods=max(days * 5 // 7, 1))
+        close = self.info['regularMarketPrice'] * np.exp(np.cumsum(rng.normal(0, 0.015, len(index))))
+        return pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.005, len(index))),
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 80_000_000, len(index)),
+        }, index=index)
+
+    def Ticker(self, symbol, session=None):
+        fake = self
+
+        class Ticker:
+            @property
+            def info(self):
+                fake.wait()
+                return dict(fake.info, symbol=symbol)
+
+            def history(self, period='1mo', interval='1d', **kwargs):
+                fake.wait()
+                return fake.history_frame(symbol, period)
+
+        return Ticker()
+
+    def download(self, tickers, period='1mo', group_by='ticker', **kwargs):
+        import pandas as pd
+
+        self.wait()
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        return pd.concat({symbol: self.history_frame(symbol, period) for symbol in symbols}, axis=1)
@@ -0,0 +1,121 @@
+"""
+Import-time benchmark for the API server and the utils modules the Streamlit apps load.
+
+Each target is imported in a fresh interpreter with `python -X importtime`, several times,
+and the median cumulative import time is compared with benchmarks/import_budget.json.
+Targets must also not pull in the heavy upstream libraries listed as deferred there;
+those are imported on first use. Exits with status 1 if any budget is exceeded.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 9 --targets server
+    python benchmarks/import_time.py --update-baseline
+"""
+import os
+import sys
+import json
+import tempfile
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.load import git_commit
+
+BUDGET_PATH = os.path.join(ROOT, 'benchmarks', 'import_budget.json')
+
+def import_profile(target, env):
+    """
+    Import target in a new interpreter; return {module: cumulative microseconds}
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def main():
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', nargs='+', default=sorted(budget['targets']))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='record these medians as baseline_ms in the budget file')
+    parser.add_argument('--output', help='results file (default benchmarks/results/importtime-<timestamp>-<commit>.json)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='mdfinance-importtime-')
+    env = dict(
+        os.environ,
+        NEWS_INGEST_ENABLED='0',
+        NEWS_STORE_PATH=os.path.join(workdir, 'news.sqlite3'),
+        ANALYSIS_CACHE_PATH=os.path.join(workdir, 'analysis.sqlite3'),
+        SENTIMENT_INDEX_PATH=os.path.join(workdir, 'sentiment.sqlite3'),
+        PYTHONDONTWRITEBYTECODE='1'
+    )
+    # Startup must not depend on AI being configured
+    env.pop('OPENAI_API_KEY', None)
+
+    results = []
+    failed = False
+    for target in args.targets:
+        profiles = [import_profile(target, env) for _ in range(args.runs)]
+        median_ms = round(statistics.median(profile[target] for profile in profiles) / 1000, 1)
+        deferred = sorted(module for module in budget['deferred'] if module in profiles[0])
+        limit = budget['targets'].get(target, {}).get('budget_ms')
+        ok = not deferred and (limit is None or median_ms <= limit)
+        failed = failed or not ok
+
+        slowest = sorted(
+            ((name, us) for name, us in profiles[0].items() if name != target and '.' not in name),
+            key=lambda item: item[1], reverse=True
+        )[:5]
+        results.append({
+            'target': target,
+            'median_ms': median_ms,
+            'budget_ms': limit,
+            'deferred_imported': deferred,
+            'slowest': {name: round(us / 1000, 1) for name, us in slowest},
+            'ok': ok,
+        })
+        print(f"{target:<24} {median_ms:>8} ms  budget {limit} ms  {'ok' if ok else 'OVER BUDGET'}"
+              + (f"  eagerly imports {', '.join(deferred)}" if deferred else ''))
+
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"importtime-{timestamp}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': timestamp,
+            'python': sys.version.split()[0],
+            'runs': args.runs,
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.update_baseline:
+        for result in results:
+            budget['targets'].setdefault(result['target'], {})['baseline_ms'] = result['median_ms']
+        with open(BUDGET_PATH, 'w') as f:
+            json.dump(budget, f, indent=2)
+            f.write('\n')
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
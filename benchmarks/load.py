@@ -0,0 +1,206 @@
+"""
+Offline load benchmark for the Flask API.
+
+Starts server.py in-process with NewsAPI, OpenAI and yfinance replaced by the fakes in
+benchmarks/fakes.py, then drives /api/news/<company> and /api/stock/<company> at each
+concurrency level and reports p50/p95/p99 latency, requests per second and errors.
+Results are written as JSON to benchmarks/results/<timestamp>-<commit>.json so runs on
+different commits can be compared. No API keys or network access are needed.
+
+    python benchmarks/load.py
+    python benchmarks/load.py --concurrency 1 8 32 --duration 20 --latency 0.3 --error-rate 0.05
+    python benchmarks/load.py --no-cache
+"""
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import tempfile
+import argparse
+import threading
+import subprocess
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COMPANIES = ['Apple', 'Microsoft', 'Alphabet', 'Amazon', 'Tesla', 'Nvidia', 'Meta', 'Netflix']
+
+ENDPOINTS = {
+    'news': '/api/news/{company}',
+    'stock': '/api/stock/{company}',
+}
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def start_server(args):
+    """
+    Import server.py against throwaway stores and fake upstreams and serve it on a free port
+    """
+    workdir = tempfile.mkdtemp(prefix='mdfinance-bench-')
+    os.environ['NEWS_STORE_PATH'] = os.path.join(workdir, 'news.sqlite3')
+    os.environ['ANALYSIS_CACHE_PATH'] = os.path.join(workdir, 'analysis.sqlite3')
+    os.environ['SENTIMENT_INDEX_PATH'] = os.path.join(workdir, 'sentiment.sqlite3')
+    os.environ['NEWS_INGEST_ENABLED'] = '0'
+    # Fixture article URLs are placeholders; there are no pages to download
+    os.environ['ARTICLE_EXTRACTION_ENABLED'] = '0'
+    os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+    os.environ.setdefault('NEWS_API_KEY', 'benchmark')
+    # The fakes have no quota; only pace LLM calls when limits are given
+    os.environ['OPENAI_RPM'] = str(args.rpm or 10 ** 6)
+    os.environ['OPENAI_TPM'] = str(args.tpm or 10 ** 9)
+
+    from werkzeug.serving import make_server
+    from benchmarks.fakes import FakeNewsApi, FakeOpenAI, FakeYFinance
+    from utils.analysis_cache import AnalysisCache
+    from utils.quote_cache import QuoteCache
+    from utils.response_cache import ResponseCache
+    from utils.news_fetcher import NewsFetcher
+    from utils.ai_analyzer import AIAnalyzer
+    from utils.stock_fetcher import StockFetcher
+    import server
+
+    upstream = {'mean_latency': args.latency, 'error_rate': args.error_rate, 'seed': args.seed}
+    fakes = {
+        'newsapi': FakeNewsApi(**upstream),
+        'openai': FakeOpenAI(**upstream),
+        'yfinance': FakeYFinance(**upstream),
+    }
+
+    if args.no_cache:
+        # Every request goes to the fake upstreams
+        server.news_fetcher = NewsFetcher(client=fakes['newsapi'], refresh_interval=-1)
+        server.ai_analyzer = AIAnalyzer(client=fakes['openai'], cache=AnalysisCache(ttl=0))
+        server.stock_fetcher = StockFetcher(quote_source=fakes['yfinance'], cache=QuoteCache(ttl=0, stale_grace=0))
+        server.response_cache = ResponseCache(max_size=0)
+    else:
+        server.news_fetcher = NewsFetcher(client=fakes['newsapi'])
+        server.ai_analyzer = AIAnalyzer(client=fakes['openai'])
+        server.stock_fetcher = StockFetcher(quote_source=fakes['yfinance'])
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    httpd = make_server('127.0.0.1', 0, server.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, fakes
+
+def run_level(base_url, path, concurrency, duration):
+    """
+    Hit path from concurrency workers for duration seconds, each with its own keep-alive session
+    """
+    import requests
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        session = requests.Session()
+        count = offset
+        while time.perf_counter() < deadline:
+            url = base_url + path.format(company=COMPANIES[count % len(COMPANIES)])
+            count += 1
+            start = time.perf_counter()
+            try:
+                response = session.get(url, timeout=60)
+                ok = response.status_code == 200
+                error = None if ok else f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                if error is None:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(error)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies) + len(errors),
+        'errors': len(errors),
+        'rps': round((len(latencies) + len(errors)) / elapsed, 2),
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+    }
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--duration', type=float, default=10, help='seconds per endpoint and level')
+    parser.add_argument('--latency', type=float, default=0.1, help='mean fake upstream latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of fake upstream calls that raise')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rpm', type=float, help='OpenAI requests per minute for the LLM scheduler (default unlimited)')
+    parser.add_argument('--tpm', type=float, help='OpenAI tokens per minute for the LLM scheduler (default unlimited)')
+    parser.add_argument('--no-cache', action='store_true', help='disable the response, news, analysis and quote caches')
+    parser.add_argument('--output', help='results file (default benchmarks/results/<timestamp>-<commit>.json)')
+    args = parser.parse_args()
+
+    httpd, fakes = start_server(args)
+    base_url = f"http://127.0.0.1:{httpd.server_port}"
+
+    results = []
+    try:
+        for name in args.endpoints:
+            for concurrency in args.concurrency:
+                result = dict(run_level(base_url, ENDPOINTS[name], concurrency, args.duration), endpoint=name)
+                results.append(result)
+                print(f"{name:<6} c={concurrency:<3} {result['rps']:>8} req/s  "
+                      f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  "
+                      f"errors {result['errors']}/{result['requests']}")
+    finally:
+        httpd.shutdown()
+
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{timestamp}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': timestamp,
+            'host': socket.gethostname(),
+            'config': {
+                'duration': args.duration,
+                'latency': args.latency,
+                'error_rate': args.error_rate,
+                'seed': args.seed,
+                'no_cache': args.no_cache,
+                'rpm': args.rpm,
+                'tpm': args.tpm,
+            },
+            'upstream_calls': {name: fake.calls for name, fake in fakes.items()},
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+if __name__ == '__main__':
+    main()
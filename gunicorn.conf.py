@@ -0,0 +1,18 @@
+# Production server configuration: gunicorn -c gunicorn.conf.py server:app
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+
+# Each worker process keeps its own quote/analysis caches and upstream connection pools;
+# threads within a worker share them, so favour threads over extra processes
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+# Long enough for a full news analysis or SSE stream; keep client connections alive between polls
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = '-'
+errorlog = '-'
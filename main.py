@@ -1,8 +1,11 @@
+import os
 import streamlit as st
-import pandas as pd
 from utils.news_fetcher import NewsFetcher
+from utils.news_ingestor import NewsIngestor
 from utils.ai_analyzer import AIAnalyzer
 from utils.stock_fetcher import StockFetcher
+from utils.quote_stream import QuoteStream
+from utils.sentiment_index import SentimentIndex
 
 # Page configuration
 st.set_page_config(
@@ -25,11 +28,39 @@ if 'selected_companies' not in st.session_state:
     st.session_state.selected_companies = []
 if 'current_company' not in st.session_state:
     st.session_state.current_company = None
+if 'analyses' not in st.session_state:
+    st.session_state.analyses = {}
 
+# Seconds between quote panel refreshes; 0 turns auto-refresh off
+QUOTE_REFRESH_SECONDS = int(os.environ.get('STREAMLIT_QUOTE_REFRESH', 60)) or None
+
+@st.cache_resource
 def init_classes():
-    return NewsFetcher(), AIAnalyzer(), StockFetcher()
+    # Shared across sessions and reruns so caches survive between them
+    news_fetcher = NewsFetcher()
+    ai_analyzer = AIAnalyzer()
+    stock_fetcher = StockFetcher()
+    sentiment_index = SentimentIndex(ticker_index=stock_fetcher.ticker_index)
+    if os.environ.get('NEWS_INGEST_ENABLED', '1') != '0':
+        NewsIngestor(news_fetcher, analyzer=ai_analyzer, sentiment_index=sentiment_index).start()
+    return news_fetcher, ai_analyzer, stock_fetcher, sentiment_index
+
+news_fetcher, ai_analyzer, stock_fetcher, sentiment_index = init_classes()
+
+@st.cache_resource
+def init_quote_stream():
+    # One poller for every session's quote panel
+    return QuoteStream(stock_fetcher)
+
+quote_stream = init_quote_stream()
 
-news_fetcher, ai_analyzer, stock_fetcher = init_classes()
+@st.cache_data(ttl=60, show_spinner=False)
+def load_news(company):
+    return news_fetcher.fetch_news(company)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def categorize(title):
+    return ai_analyzer.categorize_news(title)['category']
 
 # Header
 st.markdown("""
@@ -39,10 +70,8 @@ st.markdown("""
     </div>
     """, unsafe_allow_html=True)
 
-# Create two columns: left for company list, right for news
-col1, col2 = st.columns([1, 3])
-
-with col1:
+@st.fragment
+def watchlist():
     st.markdown("### Add Company")
     with st.form(key='add_company_form'):
         company = st.text_input("Enter a company name", key="company_input")
@@ -54,7 +83,7 @@ with col1:
             elif company not in st.session_state.selected_companies:
                 st.session_state.selected_companies.append(company)
                 st.success(f"Added {company} to your watchlist!")
-                st.rerun()
+                st.rerun(scope="fragment")
             else:
                 st.warning(f"{company} is already in your watchlist!")
 
@@ -67,17 +96,22 @@ with col1:
     # Display company list with clickable buttons
     if st.session_state.selected_companies:
         st.markdown("### Your Companies")
+        # Fetch quotes for the whole watchlist with one bulk download
+        quotes = stock_fetcher.get_stock_data_batch(st.session_state.selected_companies)
         for idx, company in enumerate(st.session_state.selected_companies):
+            quote = quotes.get(company)
             with st.container():
                 # Use a much wider ratio for the company button column
                 btn_col, remove_col = st.columns([8, 1])
                 with btn_col:
+                    label = f"{company} · ${quote['price']:.2f} ({quote['change_percent']:+.2f}%)" if quote else company
                     if st.button(
-                        company,
+                        label,
                         key=f"select_{idx}",
                         use_container_width=True,
                         type="primary" if company == st.session_state.current_company else "secondary"
                     ):
+                        # The quote panel and news list follow the selection, so rerun the whole page
                         st.session_state.current_company = company
                         st.rerun()
                 with remove_col:
@@ -87,94 +121,146 @@ with col1:
                         help=f"Remove {company}",
                     ):
                         st.session_state.selected_companies.pop(idx)
+                        st.success(f"Removed {company} from your watchlist!")
                         if st.session_state.current_company == company:
                             st.session_state.current_company = None
-                        st.success(f"Removed {company} from your watchlist!")
-                        st.rerun()
+                            st.rerun()
+                        st.rerun(scope="fragment")
     else:
         st.info("Add companies to your watchlist to view their news")
 
+def sentiment_chart(company, history):
+    """
+    News sentiment from the precomputed index, aligned to the price bars
+    """
+    sentiment = sentiment_index.aligned(company, history.t, volumes=history.volume)
+    if all(value is None for value in sentiment['rolling']):
+        return
+    import pandas as pd
+
+    st.markdown("**News sentiment** (-1 very negative, 1 very positive)")
+    st.line_chart(pd.DataFrame(
+        {
+            'Daily': sentiment['weighted'],
+            '7-day': sentiment['rolling'],
+            '7-day, volume-weighted': sentiment['volume_weighted']
+        },
+        index=pd.to_datetime(history.t, unit='s')
+    ))
+
+@st.fragment(run_every=QUOTE_REFRESH_SECONDS)
+def quote_panel(company):
+    try:
+        stock_data = stock_fetcher.get_stock_data(company)
+        if stock_data:
+            # Price, change and volume from the live poller once it has them
+            stock_data = dict(stock_data, **(quote_stream.latest([company])[company] or {}))
+            price_col, change_col, volume_col = st.columns(3)
+            with price_col:
+                st.metric(
+                    "Current Price",
+                    f"${stock_data['price']:.2f}",
+                    f"{stock_data['change_percent']:.2f}%"
+                )
+            with change_col:
+                st.metric(
+                    "Change",
+                    f"${abs(stock_data['change']):.2f}",
+                    delta_color="normal"
+                )
+            with volume_col:
+                st.metric(
+                    "Volume",
+                    f"{stock_data['volume']:,}"
+                )
+
+            # Stock price chart
+            if len(stock_data['history']):
+                st.line_chart(stock_data['history'].close_series())
+                sentiment_chart(company, stock_data['history'])
+    except Exception as e:
+        st.warning(f"Unable to fetch stock data: {str(e)}")
+
+def article_analysis(article):
+    """
+    Summary and sentiment for one article, computed only when the reader asks for them
+    """
+    key = article['url'] or article['title']
+    analysis = st.session_state.analyses.get(key)
+    summary_col, sentiment_col = st.columns([3, 1])
+
+    if analysis is None:
+        with summary_col:
+            if not st.button("Summarize and analyze sentiment", key=f"analyze_{key}"):
+                return
+            st.markdown("**Summary:**")
+            # Render the summary as it streams in
+            summary = st.write_stream(ai_analyzer.summarize_news_stream(ai_analyzer.article_text(article)))
+        analysis = {'summary': summary}
+        if ai_analyzer.enabled:
+            analysis['sentiment'] = ai_analyzer.analyze_sentiment(ai_analyzer.article_text(article))
+            if not analysis['sentiment'].get('failed'):
+                sentiment_index.record(st.session_state.current_company, [article], [analysis['sentiment']])
+        st.session_state.analyses[key] = analysis
+    else:
+        with summary_col:
+            st.markdown("**Summary:**")
+            st.markdown(analysis['summary'])
+
+    with sentiment_col:
+        sentiment = analysis.get('sentiment')
+        if sentiment and not sentiment.get('failed'):
+            st.markdown("**Sentiment Analysis:**")
+            st.progress(sentiment['confidence'])
+            st.markdown(f"Rating: {'⭐' * sentiment['rating']}")
+        else:
+            st.info("Sentiment analysis unavailable")
+
+@st.fragment
+def news_list(company):
+    st.markdown(f"### Latest News for {company}")
+
+    # News category filter
+    category = st.selectbox(
+        "Filter by Category",
+        ["All", "Technology", "Market", "Press Releases"]
+    )
+
+    try:
+        with st.spinner(f'Fetching news for {company}...'):
+            news_articles = load_news(company)
+
+        if category != "All":
+            news_articles = [
+                article for article in news_articles
+                if categorize(article['title']) == category
+            ]
+
+        if not news_articles:
+            st.info(f"No {category.lower() if category != 'All' else ''} news found for {company}")
+        else:
+            for article in news_articles:
+                with st.expander(article['title']):
+                    st.markdown(f"**Source:** {article['source']}")
+                    st.markdown(f"**Published:** {article['publishedAt']}")
+                    article_analysis(article)
+
+                    if article['url']:
+                        st.markdown(f"[Read full article]({article['url']})")
+
+    except Exception as e:
+        st.error(f"Error fetching news for {company}: {str(e)}")
+
+# Create two columns: left for company list, right for news
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    watchlist()
+
 # Display news and stock information in the right column
 with col2:
     if st.session_state.current_company:
-        # Stock information section
-        try:
-            stock_data = stock_fetcher.get_stock_data(st.session_state.current_company)
-            if stock_data:
-                price_col, change_col, volume_col = st.columns(3)
-                with price_col:
-                    st.metric(
-                        "Current Price",
-                        f"${stock_data['price']:.2f}",
-                        f"{stock_data['change_percent']:.2f}%"
-                    )
-                with change_col:
-                    st.metric(
-                        "Change",
-                        f"${abs(stock_data['change']):.2f}",
-                        delta_color="normal"
-                    )
-                with volume_col:
-                    st.metric(
-                        "Volume",
-                        f"{stock_data['volume']:,}"
-                    )
-
-                # Stock price chart
-                if stock_data['history']:
-                    st.line_chart(pd.Series(stock_data['history']))
-        except Exception as e:
-            st.warning(f"Unable to fetch stock data: {str(e)}")
-
-        st.markdown(f"### Latest News for {st.session_state.current_company}")
-
-        # News category filter
-        category = st.selectbox(
-            "Filter by Category",
-            ["All", "Technology", "Market", "Press Releases"]
-        )
-
-        try:
-            with st.spinner(f'Fetching news for {st.session_state.current_company}...'):
-                news_articles = news_fetcher.fetch_news(st.session_state.current_company)
-
-                if category != "All":
-                    news_articles = [
-                        article for article in news_articles 
-                        if ai_analyzer.categorize_news(article['title'])['category'] == category
-                    ]
-
-                if not news_articles:
-                    st.info(f"No {category.lower() if category != 'All' else ''} news found for {st.session_state.current_company}")
-                else:
-                    for article in news_articles:
-                        with st.expander(article['title']):
-                            col1, col2 = st.columns([3, 1])
-
-                            with col1:
-                                st.markdown(f"**Source:** {article['source']}")
-                                st.markdown(f"**Published:** {article['publishedAt']}")
-                                st.markdown("**Summary:**")
-                                try:
-                                    summary = ai_analyzer.summarize_news(article['description'])
-                                    st.write(summary)
-                                except Exception as e:
-                                    st.warning("Could not generate summary. Using original description.")
-                                    st.write(article['description'])
-
-                            with col2:
-                                try:
-                                    sentiment = ai_analyzer.analyze_sentiment(article['description'])
-                                    st.markdown("**Sentiment Analysis:**")
-                                    st.progress(sentiment['confidence'])
-                                    st.markdown(f"Rating: {'⭐' * sentiment['rating']}")
-                                except Exception as e:
-                                    st.info("Sentiment analysis unavailable")
-
-                            if article['url']:
-                                st.markdown(f"[Read full article]({article['url']})")
-
-        except Exception as e:
-            st.error(f"Error fetching news for {st.session_state.current_company}: {str(e)}")
+        quote_panel(st.session_state.current_company)
+        news_list(st.session_state.current_company)
     else:
-        st.info("Select a company from the list to view its news")
\ No newline at end of file
+        st.info("Select a company from the list to view its news")
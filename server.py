@@ -1,9 +1,20 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from utils.news_fetcher import NewsFetcher
-from utils.ai_analyzer import AIAnalyzer
-from utils.stock_fetcher import StockFetcher
+from utils.news_ingestor import NewsIngestor
+from utils.ai_analyzer import AIAnalyzer, FAILED_SUMMARY
+from utils.stock_fetcher import StockFetcher, PERIODS, INTERVALS
+from utils.news_store import NewsStore
+from utils.response_cache import ResponseCache
+from utils.static_files import StaticManifest
+from utils.quote_stream import QuoteStream
+from utils.sentiment_index import SentimentIndex
+from utils.concurrency import get_executor
+from utils import metrics
 import os
+import json
+import time
+import queue
 
 app = Flask(__name__, static_folder='dist')
 CORS(app)  # Enable CORS for all routes
@@ -11,40 +22,303 @@ CORS(app)  # Enable CORS for all routes
 news_fetcher = NewsFetcher()
 ai_analyzer = AIAnalyzer()
 stock_fetcher = StockFetcher()
+# Every article sentiment computed below is kept, for sentiment-vs-price history
+sentiment_index = SentimentIndex(ticker_index=stock_fetcher.ticker_index)
+if os.environ.get('NEWS_INGEST_ENABLED', '1') != '0':
+    NewsIngestor(news_fetcher, analyzer=ai_analyzer, sentiment_index=sentiment_index).start()
+# One quote poller per process, shared by every /api/quotes/stream client
+quote_stream = QuoteStream(stock_fetcher)
+response_cache = ResponseCache()
+# The built frontend is read into memory once; restart the server after `npx vite build`
+static_files = StaticManifest(app.static_folder)
+
+def cached_response(entry):
+    """
+    Serve a CachedResponse in the encoding the client accepts, or 304 if its ETag still matches
+    """
+    encoding, body = entry.negotiate(request.headers.get('Accept-Encoding'))
+    headers = {
+        'ETag': entry.etag(encoding),
+        'Cache-Control': f'public, max-age={entry.remaining()}' if entry.ttl > 0 else 'no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+    if entry.matches(request.headers.get('If-None-Match')):
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, mimetype=entry.mimetype, headers=headers)
+
+def categorize(articles):
+    results = ai_analyzer.categorize_concurrent([article['title'] for article in articles])
+    for article, result in zip(articles, results):
+        article['category'] = result['category']
+    return articles
+
+def load_articles(company, category):
+    articles = news_fetcher.fetch_news(company)
+    # Without a filter, categories come from each article's analysis instead
+    if category == 'All':
+        return articles
+
+    # Filter before analysis so only returned articles are summarized
+    return [article for article in categorize(articles) if article['category'] == category]
+
+def without_content(article):
+    # Full text is only used for analysis; keep it out of responses
+    return {key: value for key, value in article.items() if key != 'content'}
+
+def build_news(company, category):
+    articles = load_articles(company, category)
+
+    # Add AI analysis, one request per article running in parallel
+    analyses = ai_analyzer.analyze_concurrent(articles)
+    for article, analysis in zip(articles, analyses):
+        article.update({key: value for key, value in analysis.items() if key != 'category'})
+        if 'category' not in article:
+            article['category'] = ai_analyzer.category_from_analysis(article['title'], analysis)
+    sentiment_index.record(company, articles, [ai_analyzer.scored_sentiment(analysis) for analysis in analyses])
+
+    # Don't cache responses with placeholder analyses, or with no articles at all; the next poll
+    # should retry them
+    partial = any(article.get('partial') or article.get('summary') == FAILED_SUMMARY for article in articles)
+    ttl = 0 if partial or not articles else news_fetcher.refresh_interval
+    return app.json.dumps([without_content(article) for article in articles]).encode('utf-8'), 'application/json', ttl
 
 @app.route('/api/news/<company>')
 def get_news(company):
     try:
-        articles = news_fetcher.fetch_news(company)
-        for article in articles:
-            # Add AI analysis
-            article['summary'] = ai_analyzer.summarize_news(article['description'])
-            article['sentiment'] = ai_analyzer.analyze_sentiment(article['description'])
-        return jsonify(articles)
+        category = request.args.get('category', 'All')
+        key = ('news', NewsStore.normalize_company(company), category)
+        entry = response_cache.get_or_build(key, lambda: build_news(company, category))
+        return cached_response(entry)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/news/<company>/stream')
+def stream_news(company):
+    """
+    Server-Sent Events version of /api/news/<company>: sends article metadata first,
+    then summary chunks, sentiment and (for unfiltered titles the local classifier is
+    unsure about) the LLM category of each article as they arrive. Not kept in the
+    response cache; summaries and sentiments already analyzed come from the analysis cache.
+    """
+    try:
+        category = request.args.get('category', 'All')
+        articles = load_articles(company, category)
+        uncertain = []
+        if category == 'All':
+            # Metadata goes out with the local classifier's category; titles it is unsure
+            # about get the LLM's answer in a later 'category' event
+            for index, article in enumerate(articles):
+                article['category'], needs_llm = ai_analyzer.categorize_local(article['title'])
+                if needs_llm:
+                    uncertain.append(index)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    def events():
+        yield sse('articles', [without_content(article) for article in articles])
+
+        updates = queue.Queue()
+
+        def stream_summary(index, article):
+            try:
+                for delta in ai_analyzer.summarize_news_stream(ai_analyzer.article_text(article)):
+                    updates.put(sse('summary', {'index': index, 'delta': delta}))
+            finally:
+                updates.put(None)
+
+        def send_sentiment(index, article):
+            try:
+                sentiment = ai_analyzer.analyze_sentiment(ai_analyzer.article_text(article))
+                updates.put(sse('sentiment', {'index': index, 'sentiment': sentiment}))
+                if not sentiment.get('failed'):
+                    sentiment_index.record(company, [article], [sentiment])
+            finally:
+                updates.put(None)
+
+        def send_category(index, article):
+            try:
+                metrics.inc('classifications_total', source='llm')
+                result = ai_analyzer.categorize_news_llm(article['title'])
+                updates.put(sse('category', {'index': index, 'category': result['category']}))
+            finally:
+                updates.put(None)
+
+        executor = get_executor('ai-analyzer', ai_analyzer.max_concurrency)
+        for index, article in enumerate(articles):
+            executor.submit(stream_summary, index, article)
+            executor.submit(send_sentiment, index, article)
+        for index in uncertain:
+            executor.submit(send_category, index, articles[index])
+
+        remaining = 2 * len(articles) + len(uncertain)
+        while remaining:
+            try:
+                # Give up on the rest if nothing arrives within one call timeout
+                update = updates.get(timeout=ai_analyzer.call_timeout)
+            except queue.Empty:
+                break
+            if update is None:
+                remaining -= 1
+            else:
+                yield update
+
+        yield sse('done', {'partial': remaining > 0})
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/stock/<company>')
 def get_stock(company):
     try:
-        stock_data = stock_fetcher.get_stock_data(company)
-        if stock_data:
-            return jsonify(stock_data)
+        period = request.args.get('period', '1mo')
+        interval = request.args.get('interval', '1d')
+        if period not in PERIODS or interval not in INTERVALS:
+            return jsonify({'error': 'Invalid period or interval'}), 400
+        # Maximum number of history points; longer ranges are downsampled with LTTB
+        points = request.args.get('points', 500, type=int)
+        fields = request.args.get('fields', 'c').split(',')
+
+        def build_stock():
+            stock_data = stock_fetcher.get_stock_data(company, period=period, interval=interval)
+            if not stock_data:
+                return None
+            history = stock_data['history'].downsample(max(points, 3))
+            body = app.json.dumps(dict(stock_data, history=history.to_dict(fields)))
+            return body.encode('utf-8'), 'application/json', stock_fetcher.cache_timeout
+
+        key = ('stock', NewsStore.normalize_company(company), period, interval, points, ','.join(fields))
+        entry = response_cache.get_or_build(key, build_stock)
+        if entry is not None:
+            return cached_response(entry)
         return jsonify({'error': 'Stock data not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sentiment/<company>')
+def get_sentiment(company):
+    """
+    Daily news sentiment aligned to the company's daily price bars over period, with rolling
+    score and momentum over window days
+    """
+    try:
+        period = request.args.get('period', '1mo')
+        window = request.args.get('window', 7, type=int)
+        if period not in PERIODS or not 1 <= window <= 90:
+            return jsonify({'error': 'Invalid period or window'}), 400
+
+        def build_sentiment():
+            stock_data = stock_fetcher.get_stock_data(company, period=period, interval='1d')
+            if not stock_data:
+                return None
+            history = stock_data['history']
+            body = app.json.dumps({
+                'symbol': stock_data['symbol'],
+                'window': window,
+                'history': history.to_dict(('c',)),
+                'sentiment': sentiment_index.aligned(company, history.t, window, history.volume)
+            })
+            return body.encode('utf-8'), 'application/json', stock_fetcher.cache_timeout
+
+        key = ('sentiment', NewsStore.normalize_company(company), period, window)
+        entry = response_cache.get_or_build(key, build_sentiment)
+        if entry is not None:
+            return cached_response(entry)
+        return jsonify({'error': 'Stock data not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stocks')
+def get_stocks():
+    try:
+        symbols = [s.strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+        if not symbols:
+            return jsonify({'error': 'No symbols provided'}), 400
+
+        stocks = stock_fetcher.get_stock_data_batch(symbols)
+        return jsonify({
+            company: {
+                key: data[key] for key in ('symbol', 'price', 'change', 'change_percent', 'volume')
+            } if data else None
+            for company, data in stocks.items()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/quotes/stream')
+def stream_quotes():
+    """
+    Server-Sent Events of live quotes for ?symbols=: a 'snapshot' event with every known
+    quote, then 'quote' events carrying only the fields that changed. The stream ends after
+    quote_stream.max_connection seconds; EventSource reconnects and gets a fresh snapshot.
+    """
+    symbols = [s.strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    if not symbols:
+        return jsonify({'error': 'No symbols provided'}), 400
+
+    subscription = quote_stream.subscribe(symbols[:50])
+
+    def events():
+        try:
+            deadline = time.monotonic() + quote_stream.max_connection
+            # Reconnect after one second rather than the browser default of a few
+            yield "retry: 1000\n\n"
+            yield sse('snapshot', quote_stream.snapshot(subscription))
+            while time.monotonic() < deadline:
+                if subscription.resync:
+                    yield sse('snapshot', quote_stream.snapshot(subscription))
+                try:
+                    update = subscription.queue.get(timeout=max(0.0, min(15, deadline - time.monotonic())))
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse('quote', update)
+        finally:
+            quote_stream.unsubscribe(subscription)
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/metrics')
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # Serve static files from the dist directory
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    if path and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    # Always return index.html for any unknown routes (client-side routing)
-    return send_from_directory(app.static_folder, 'index.html')
+    # Unknown routes get index.html (client-side routing)
+    asset = static_files.get(path)
+    if asset is None:
+        return jsonify({'error': 'Frontend not built'}), 404
+
+    encoding, body = asset.negotiate(request.headers.get('Accept-Encoding'))
+    headers = {
+        'ETag': asset.etag(encoding),
+        'Last-Modified': asset.last_modified,
+        'Cache-Control': asset.cache_control,
+        'Vary': 'Accept-Encoding'
+    }
+    if asset.not_modified(request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since')):
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, mimetype=asset.mimetype, headers=headers)
 
 if __name__ == '__main__':
-    # Kill any existing process on port 5000
-    os.system('fuser -k 5000/tcp >/dev/null 2>&1 || true')
-    # Ensure the server is accessible from outside
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+    # Development server only; in production run `gunicorn -c gunicorn.conf.py server:app`
+    app.run(
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 5000)),
+        debug=False,
+        threaded=True
+    )
@@ -3,11 +3,45 @@ import { MantineProvider } from '@mantine/core';
 import { CompanyList } from './components/CompanyList';
 import { NewsSection } from './components/NewsSection';
 import { StockSection } from './components/StockSection';
+import { SentimentSection } from './components/SentimentSection';
 import './styles/App.css';
 
 function App() {
   const [selectedCompanies, setSelectedCompanies] = useState([]);
   const [currentCompany, setCurrentCompany] = useState(null);
+  const [quotes, setQuotes] = useState({});
+
+  useEffect(() => {
+    if (selectedCompanies.length === 0) {
+      return;
+    }
+
+    // One live quote stream per tab for the whole watchlist: a snapshot, then only the
+    // fields that changed. The server ends it every few minutes and EventSource reconnects.
+    const source = new EventSource(
+      `/api/quotes/stream?symbols=${encodeURIComponent(selectedCompanies.join(','))}`
+    );
+
+    source.addEventListener('snapshot', (event) => {
+      setQuotes(JSON.parse(event.data));
+    });
+
+    source.addEventListener('quote', (event) => {
+      const changes = JSON.parse(event.data);
+      setQuotes((current) => {
+        const next = { ...current };
+        Object.entries(changes).forEach(([company, fields]) => {
+          next[company] = { ...next[company], ...fields };
+        });
+        return next;
+      });
+    });
+
+    // EventSource reconnects by itself after network errors
+    source.onerror = (err) => console.error(err);
+
+    return () => source.close();
+  }, [selectedCompanies]);
 
   const handleAddCompany = (company) => {
     if (selectedCompanies.length >= 5) {
@@ -38,6 +72,7 @@ function App() {
           <div className="sidebar">
             <CompanyList
               companies={selectedCompanies}
+              quotes={quotes}
               currentCompany={currentCompany}
               onAddCompany={handleAddCompany}
               onRemoveCompany={handleRemoveCompany}
@@ -48,7 +83,8 @@ function App() {
           <div className="content">
             {currentCompany ? (
               <>
-                <StockSection company={currentCompany} />
+                <StockSection company={currentCompany} quote={quotes[currentCompany]} />
+                <SentimentSection company={currentCompany} />
                 <NewsSection company={currentCompany} />
               </>
             ) : (
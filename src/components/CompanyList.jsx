@@ -1,9 +1,10 @@
 import React, { useState } from 'react';
-import { Button, TextInput, Paper, Title, Stack, ActionIcon, Tooltip } from '@mantine/core';
+import { Button, TextInput, Paper, Title, Stack, ActionIcon, Tooltip, Text } from '@mantine/core';
 import { IconTrash } from '@tabler/icons-react';
 
 export function CompanyList({ 
   companies, 
+  quotes,
   currentCompany, 
   onAddCompany, 
   onRemoveCompany, 
@@ -48,6 +49,16 @@ export function CompanyList({
                   fullWidth
                 >
                   {company}
+                  {quotes[company] && (
+                    <Text
+                      component="span"
+                      size="xs"
+                      ml="xs"
+                      color={quotes[company].change_percent >= 0 ? 'green' : 'red'}
+                    >
+                      ${quotes[company].price.toFixed(2)} ({quotes[company].change_percent.toFixed(2)}%)
+                    </Text>
+                  )}
                 </Button>
                 <Tooltip label={`Remove ${company}`} position="right">
                   <ActionIcon
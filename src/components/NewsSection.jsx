@@ -1,6 +1,5 @@
 import React, { useState, useEffect } from 'react';
 import { Paper, Title, Select, Accordion, Group, Text, Progress, Stack } from '@mantine/core';
-import axios from 'axios';
 
 export function NewsSection({ company }) {
   const [news, setNews] = useState([]);
@@ -9,23 +8,58 @@ export function NewsSection({ company }) {
   const [category, setCategory] = useState('All');
 
   useEffect(() => {
-    const fetchNews = async () => {
-      setLoading(true);
-      try {
-        const response = await axios.get(`/api/news/${company}?category=${category}`);
-        setNews(response.data);
-        setError(null);
-      } catch (err) {
+    if (!company) {
+      return;
+    }
+
+    setLoading(true);
+    setNews([]);
+    let received = false;
+    const source = new EventSource(
+      `/api/news/${encodeURIComponent(company)}/stream?category=${encodeURIComponent(category)}`
+    );
+
+    // Update a single article as its summary, sentiment and category stream in
+    const updateArticle = (index, update) => {
+      setNews((articles) => articles.map(
+        (article, i) => (i === index ? { ...article, ...update(article) } : article)
+      ));
+    };
+
+    source.addEventListener('articles', (event) => {
+      received = true;
+      setNews(JSON.parse(event.data).map((article) => ({ ...article, summary: '', sentiment: null })));
+      setError(null);
+      setLoading(false);
+    });
+
+    source.addEventListener('summary', (event) => {
+      const { index, delta } = JSON.parse(event.data);
+      updateArticle(index, (article) => ({ summary: article.summary + delta }));
+    });
+
+    source.addEventListener('sentiment', (event) => {
+      const { index, sentiment } = JSON.parse(event.data);
+      updateArticle(index, () => ({ sentiment }));
+    });
+
+    source.addEventListener('category', (event) => {
+      const { index, category } = JSON.parse(event.data);
+      updateArticle(index, () => ({ category }));
+    });
+
+    source.addEventListener('done', () => source.close());
+
+    source.onerror = (err) => {
+      source.close();
+      if (!received) {
         setError('Unable to fetch news');
         console.error(err);
-      } finally {
-        setLoading(false);
       }
+      setLoading(false);
     };
 
-    if (company) {
-      fetchNews();
-    }
+    return () => source.close();
   }, [company, category]);
 
   return (
@@ -60,15 +94,23 @@ export function NewsSection({ company }) {
                     </div>
                     <div>
                       <Text weight={500}>Sentiment Analysis</Text>
-                      <Progress 
-                        value={article.sentiment.confidence * 100} 
-                        label={`${(article.sentiment.confidence * 100).toFixed(0)}%`}
-                      />
-                      <Text>Rating: {'⭐'.repeat(article.sentiment.rating)}</Text>
+                      {article.sentiment && article.sentiment.failed ? (
+                        <Text size="sm">Sentiment analysis unavailable</Text>
+                      ) : article.sentiment ? (
+                        <>
+                          <Progress 
+                            value={article.sentiment.confidence * 100} 
+                            label={`${(article.sentiment.confidence * 100).toFixed(0)}%`}
+                          />
+                          <Text>Rating: {'⭐'.repeat(article.sentiment.rating)}</Text>
+                        </>
+                      ) : (
+                        <Text size="sm">Analyzing...</Text>
+                      )}
                     </div>
                   </Group>
 
-                  <Text>{article.summary}</Text>
+                  <Text>{article.summary || 'Summarizing...'}</Text>
 
                   <Text>
                     <a href={article.url} target="_blank" rel="noopener noreferrer">
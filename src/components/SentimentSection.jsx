@@ -0,0 +1,114 @@
+import React, { useState, useEffect } from 'react';
+import { Paper, Title, Text, Loader, SegmentedControl } from '@mantine/core';
+import { Line } from 'react-chartjs-2';
+import axios from 'axios';
+
+export function SentimentSection({ company }) {
+  const [data, setData] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const [period, setPeriod] = useState('1mo');
+
+  useEffect(() => {
+    const fetchSentiment = async () => {
+      setLoading(true);
+      try {
+        // Precomputed daily sentiment, aligned to the daily price bars
+        const response = await axios.get(`/api/sentiment/${encodeURIComponent(company)}`, {
+          params: { period, window: 7 }
+        });
+        setData(response.data);
+        setError(null);
+      } catch (err) {
+        setError('Unable to fetch sentiment history');
+        console.error(err);
+      } finally {
+        setLoading(false);
+      }
+    };
+
+    if (company) {
+      fetchSentiment();
+    }
+  }, [company, period]);
+
+  if (loading) {
+    return <Loader />;
+  }
+
+  if (error) {
+    return <Text color="red">{error}</Text>;
+  }
+
+  if (!data) {
+    return null;
+  }
+
+  const { history, sentiment } = data;
+  const chartData = {
+    labels: history.t.map((t) => new Date(t * 1000).toLocaleDateString()),
+    datasets: [
+      {
+        label: 'Stock Price',
+        data: history.c,
+        borderColor: 'rgb(75, 192, 192)',
+        tension: 0.1,
+        yAxisID: 'price'
+      },
+      {
+        label: `${data.window}-day sentiment`,
+        data: sentiment.rolling,
+        borderColor: 'rgb(255, 159, 64)',
+        tension: 0.1,
+        spanGaps: true,
+        yAxisID: 'sentiment'
+      },
+      {
+        label: `${data.window}-day, volume-weighted`,
+        data: sentiment.volume_weighted,
+        borderColor: 'rgb(153, 102, 255)',
+        tension: 0.1,
+        spanGaps: true,
+        yAxisID: 'sentiment'
+      },
+      {
+        label: 'Daily sentiment',
+        data: sentiment.weighted,
+        borderColor: 'rgba(255, 159, 64, 0.4)',
+        showLine: false,
+        yAxisID: 'sentiment'
+      }
+    ]
+  };
+
+  return (
+    <Paper p="md" radius="md" mt="md">
+      <Title order={3} mb="sm">News Sentiment vs Price</Title>
+
+      <SegmentedControl
+        value={period}
+        onChange={setPeriod}
+        data={['1mo', '3mo', '6mo', '1y']}
+        mb="sm"
+      />
+
+      {sentiment.rolling.every((value) => value === null) ? (
+        <Text color="dimmed">No sentiment recorded for {company} in this period yet</Text>
+      ) : (
+        <div style={{ height: '300px' }}>
+          <Line
+            data={chartData}
+            options={{
+              responsive: true,
+              maintainAspectRatio: false,
+              scales: {
+                price: { type: 'linear', position: 'left' },
+                sentiment: { type: 'linear', position: 'right', min: -1, max: 1, grid: { drawOnChartArea: false } }
+              }
+            }}
+          />
+        </div>
+      )}
+    </Paper>
+  );
+}
@@ -1,18 +1,22 @@
 import React, { useState, useEffect } from 'react';
-import { Paper, Group, Text, Loader } from '@mantine/core';
+import { Paper, Group, Text, Loader, SegmentedControl } from '@mantine/core';
 import { Line } from 'react-chartjs-2';
 import axios from 'axios';
 
-export function StockSection({ company }) {
+export function StockSection({ company, quote }) {
   const [stockData, setStockData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [period, setPeriod] = useState('1mo');
 
   useEffect(() => {
     const fetchStockData = async () => {
       setLoading(true);
       try {
-        const response = await axios.get(`/api/stock/${company}`);
+        // Columnar history, downsampled on the server for long periods
+        const response = await axios.get(`/api/stock/${company}`, {
+          params: { period, points: 300, fields: 'c' }
+        });
         setStockData(response.data);
         setError(null);
       } catch (err) {
@@ -26,7 +30,7 @@ export function StockSection({ company }) {
     if (company) {
       fetchStockData();
     }
-  }, [company]);
+  }, [company, period]);
 
   if (loading) {
     return <Loader />;
@@ -40,11 +44,14 @@ export function StockSection({ company }) {
     return null;
   }
 
+  // Price, change and volume stay live from the app's quote stream without re-requesting the chart
+  const current = quote ? { ...stockData, ...quote } : stockData;
+
   const chartData = {
-    labels: Object.keys(stockData.history),
+    labels: stockData.history.t.map((t) => new Date(t * 1000).toLocaleDateString()),
     datasets: [{
       label: 'Stock Price',
-      data: Object.values(stockData.history),
+      data: stockData.history.c,
       borderColor: 'rgb(75, 192, 192)',
       tension: 0.1
     }]
@@ -55,21 +62,28 @@ export function StockSection({ company }) {
       <Group position="apart" mb="md">
         <div>
           <Text size="lg" weight={500}>Current Price</Text>
-          <Text size="xl">${stockData.price.toFixed(2)}</Text>
-          <Text color={stockData.change_percent >= 0 ? 'green' : 'red'}>
-            {stockData.change_percent.toFixed(2)}%
+          <Text size="xl">${current.price.toFixed(2)}</Text>
+          <Text color={current.change_percent >= 0 ? 'green' : 'red'}>
+            {current.change_percent.toFixed(2)}%
           </Text>
         </div>
         <div>
           <Text size="lg" weight={500}>Change</Text>
-          <Text size="xl">${Math.abs(stockData.change).toFixed(2)}</Text>
+          <Text size="xl">${Math.abs(current.change).toFixed(2)}</Text>
         </div>
         <div>
           <Text size="lg" weight={500}>Volume</Text>
-          <Text size="xl">{stockData.volume.toLocaleString()}</Text>
+          <Text size="xl">{current.volume.toLocaleString()}</Text>
         </div>
       </Group>
 
+      <SegmentedControl
+        value={period}
+        onChange={setPeriod}
+        data={['1mo', '6mo', '1y', '5y', 'max']}
+        mb="sm"
+      />
+
       <div style={{ height: '300px' }}>
         <Line
           data={chartData}
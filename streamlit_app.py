@@ -1,8 +1,11 @@
+import os
 import streamlit as st
-import pandas as pd
 from utils.news_fetcher import NewsFetcher
+from utils.news_ingestor import NewsIngestor
 from utils.ai_analyzer import AIAnalyzer
 from utils.stock_fetcher import StockFetcher
+from utils.quote_stream import QuoteStream
+from utils.sentiment_index import SentimentIndex
 
 # Page configuration
 st.set_page_config(
@@ -11,14 +14,42 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize classes
-news_fetcher = NewsFetcher()
-ai_analyzer = AIAnalyzer()
-stock_fetcher = StockFetcher()
+# Initialize classes once, shared across sessions and reruns so caches survive between them
+@st.cache_resource
+def init_classes():
+    news_fetcher = NewsFetcher()
+    ai_analyzer = AIAnalyzer()
+    stock_fetcher = StockFetcher()
+    sentiment_index = SentimentIndex(ticker_index=stock_fetcher.ticker_index)
+    if os.environ.get('NEWS_INGEST_ENABLED', '1') != '0':
+        NewsIngestor(news_fetcher, analyzer=ai_analyzer, sentiment_index=sentiment_index).start()
+    return news_fetcher, ai_analyzer, stock_fetcher, sentiment_index
+
+news_fetcher, ai_analyzer, stock_fetcher, sentiment_index = init_classes()
+
+@st.cache_resource
+def init_quote_stream():
+    # One poller for every session's quote panel
+    return QuoteStream(stock_fetcher)
+
+quote_stream = init_quote_stream()
+
+# Seconds between quote refreshes; 0 turns auto-refresh off
+QUOTE_REFRESH_SECONDS = int(os.environ.get('STREAMLIT_QUOTE_REFRESH', 60)) or None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_news(company):
+    return news_fetcher.fetch_news(company)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def categorize(title):
+    return ai_analyzer.categorize_news(title)['category']
 
 # Initialize session state
 if 'selected_companies' not in st.session_state:
     st.session_state.selected_companies = []
+if 'analyses' not in st.session_state:
+    st.session_state.analyses = {}
 
 # Header
 st.markdown("""
@@ -28,10 +59,8 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Create two columns
-col1, col2 = st.columns([1, 3])
-
-with col1:
+@st.fragment
+def watchlist():
     st.markdown("### Add Company")
     with st.form(key='add_company_form'):
         company = st.text_input("Enter a company name")
@@ -43,7 +72,7 @@ with col1:
             elif company not in st.session_state.selected_companies:
                 st.session_state.selected_companies.append(company)
                 st.success(f"Added {company} to your watchlist!")
-                st.rerun()
+                st.rerun(scope="fragment")
 
     if st.button("Clear All Companies"):
         st.session_state.selected_companies = []
@@ -54,83 +83,143 @@ with col1:
     # Display company list
     if st.session_state.selected_companies:
         st.markdown("### Your Companies")
+        # Fetch quotes for the whole watchlist with one bulk download
+        quotes = stock_fetcher.get_stock_data_batch(st.session_state.selected_companies)
         for company in st.session_state.selected_companies:
+            quote = quotes.get(company)
+            label = f"{company} · ${quote['price']:.2f} ({quote['change_percent']:+.2f}%)" if quote else company
             cols = st.columns([4, 1])
             with cols[0]:
-                if st.button(company, key=f"select_{company}", use_container_width=True):
+                if st.button(label, key=f"select_{company}", use_container_width=True):
                     st.session_state.current_company = company
                     st.rerun()
             with cols[1]:
                 if st.button("🗑", key=f"remove_{company}", help=f"Remove {company}"):
                     st.session_state.selected_companies.remove(company)
+                    st.success(f"Removed {company}")
                     if 'current_company' in st.session_state and st.session_state.current_company == company:
                         st.session_state.current_company = None
-                    st.success(f"Removed {company}")
-                    st.rerun()
+                        st.rerun()
+                    st.rerun(scope="fragment")
+
+def sentiment_chart(company, history):
+    # News sentiment from the precomputed index, aligned to the price bars
+    sentiment = sentiment_index.aligned(company, history.t, volumes=history.volume)
+    if all(value is None for value in sentiment['rolling']):
+        return
+    import pandas as pd
+
+    st.markdown("**News sentiment** (-1 very negative, 1 very positive)")
+    st.line_chart(pd.DataFrame(
+        {
+            'Daily': sentiment['weighted'],
+            '7-day': sentiment['rolling'],
+            '7-day, volume-weighted': sentiment['volume_weighted']
+        },
+        index=pd.to_datetime(history.t, unit='s')
+    ))
+
+@st.fragment(run_every=QUOTE_REFRESH_SECONDS)
+def stock_info(company):
+    try:
+        stock_data = stock_fetcher.get_stock_data(company)
+        if stock_data:
+            # Price, change and volume from the live poller once it has them
+            stock_data = dict(stock_data, **(quote_stream.latest([company])[company] or {}))
+            cols = st.columns(3)
+            with cols[0]:
+                st.metric("Current Price", f"${stock_data['price']:.2f}", f"{stock_data['change_percent']:.2f}%")
+            with cols[1]:
+                st.metric("Change", f"${abs(stock_data['change']):.2f}")
+            with cols[2]:
+                st.metric("Volume", f"{stock_data['volume']:,}")
+            
+            # Stock chart
+            if len(stock_data['history']):
+                st.line_chart(stock_data['history'].close_series())
+                sentiment_chart(company, stock_data['history'])
+    except Exception as e:
+        st.warning(f"Unable to fetch stock data: {str(e)}")
+
+def article_analysis(article):
+    # Summary and sentiment are only requested once the reader asks for them
+    key = article['url'] or article['title']
+    analysis = st.session_state.analyses.get(key)
+    col1, col2 = st.columns([3, 1])
+
+    if analysis is None:
+        with col1:
+            if not st.button("Summarize and analyze sentiment", key=f"analyze_{key}"):
+                return
+            st.markdown("**Summary:**")
+            # Render the summary as it streams in
+            analysis = {'summary': st.write_stream(ai_analyzer.summarize_news_stream(ai_analyzer.article_text(article)))}
+        if ai_analyzer.enabled:
+            analysis['sentiment'] = ai_analyzer.analyze_sentiment(ai_analyzer.article_text(article))
+            if not analysis['sentiment'].get('failed'):
+                sentiment_index.record(st.session_state.current_company, [article], [analysis['sentiment']])
+        st.session_state.analyses[key] = analysis
+    else:
+        with col1:
+            st.markdown("**Summary:**")
+            st.markdown(analysis['summary'])
+
+    with col2:
+        sentiment = analysis.get('sentiment')
+        if sentiment and not sentiment.get('failed'):
+            st.markdown("**Sentiment Analysis:**")
+            st.progress(sentiment['confidence'])
+            st.markdown(f"Rating: {'⭐' * sentiment['rating']}")
+        else:
+            st.info("Sentiment analysis unavailable")
+
+@st.fragment
+def news_section(company):
+    st.markdown(f"### Latest News for {company}")
+    
+    # News category filter
+    category = st.selectbox(
+        "Filter by Category",
+        ["All", "Technology", "Market", "Press Releases"]
+    )
+
+    try:
+        with st.spinner(f'Fetching news for {company}...'):
+            news_articles = load_news(company)
+
+        if category != "All":
+            news_articles = [
+                article for article in news_articles 
+                if categorize(article['title']) == category
+            ]
+
+        if not news_articles:
+            st.info(f"No {category.lower() if category != 'All' else ''} news found for {company}")
+        else:
+            for article in news_articles:
+                with st.expander(article['title']):
+                    st.markdown(f"**Source:** {article['source']}")
+                    st.markdown(f"**Published:** {article['publishedAt']}")
+                    article_analysis(article)
+                    
+                    st.markdown(f"[Read full article]({article['url']})")
+    except Exception as e:
+        st.error(f"Error fetching news: {str(e)}")
+
+# Create two columns
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    watchlist()
 
 with col2:
     if 'current_company' in st.session_state and st.session_state.current_company:
         company = st.session_state.current_company
         
         # Stock information
-        try:
-            stock_data = stock_fetcher.get_stock_data(company)
-            if stock_data:
-                cols = st.columns(3)
-                with cols[0]:
-                    st.metric("Current Price", f"${stock_data['price']:.2f}", f"{stock_data['change_percent']:.2f}%")
-                with cols[1]:
-                    st.metric("Change", f"${abs(stock_data['change']):.2f}")
-                with cols[2]:
-                    st.metric("Volume", f"{stock_data['volume']:,}")
-                
-                # Stock chart
-                if stock_data['history']:
-                    st.line_chart(pd.Series(stock_data['history']))
-        except Exception as e:
-            st.warning(f"Unable to fetch stock data: {str(e)}")
+        stock_info(company)
 
         # News section
-        st.markdown(f"### Latest News for {company}")
-        
-        # News category filter
-        category = st.selectbox(
-            "Filter by Category",
-            ["All", "Technology", "Market", "Press Releases"]
-        )
-
-        try:
-            with st.spinner(f'Fetching news for {company}...'):
-                news_articles = news_fetcher.fetch_news(company)
-                
-                if category != "All":
-                    news_articles = [
-                        article for article in news_articles 
-                        if ai_analyzer.categorize_news(article['title'])['category'] == category
-                    ]
-
-                if not news_articles:
-                    st.info(f"No {category.lower() if category != 'All' else ''} news found for {company}")
-                else:
-                    for article in news_articles:
-                        with st.expander(article['title']):
-                            col1, col2 = st.columns([3, 1])
-                            
-                            with col1:
-                                st.markdown(f"**Source:** {article['source']}")
-                                st.markdown(f"**Published:** {article['publishedAt']}")
-                                st.markdown("**Summary:**")
-                                summary = ai_analyzer.summarize_news(article['description'])
-                                st.write(summary)
-                                
-                            with col2:
-                                sentiment = ai_analyzer.analyze_sentiment(article['description'])
-                                st.markdown("**Sentiment Analysis:**")
-                                st.progress(sentiment['confidence'])
-                                st.markdown(f"Rating: {'⭐' * sentiment['rating']}")
-                            
-                            st.markdown(f"[Read full article]({article['url']})")
-        except Exception as e:
-            st.error(f"Error fetching news: {str(e)}")
+        news_section(company)
     else:
         st.info("Select a company from the list to view its news and stock information")
@@ -0,0 +1,54 @@
+import json
+from types import SimpleNamespace
+import pytest
+from utils.ai_analyzer import AIAnalyzer, FAILED_SUMMARY
+from utils.analysis_cache import AnalysisCache
+
+class BatchClient:
+    """
+    Chat client answering batch requests with only the given fields of each article
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        answer = {'summary': 'Apple beat estimates.', 'sentiment': {'rating': 4, 'confidence': 0.9},
+                  'category': 'Market'}
+        articles = [
+            dict({'id': article['id']}, **{field: answer[field] for field in self.fields})
+            for article in json.loads(messages[-1]['content'])
+        ]
+        message = SimpleNamespace(content=json.dumps({'articles': articles}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+
+    def build(client):
+        return AIAnalyzer(cache=AnalysisCache(str(tmp_path / 'analysis.sqlite3')), client=client)
+    return build
+
+ARTICLES = [{'title': 'Apple earnings', 'description': 'Apple reported revenue above expectations.'}]
+
+def test_complete_batch_answers_are_cached(analyzer):
+    client = BatchClient(('summary', 'sentiment', 'category'))
+    ai = analyzer(client)
+    first = ai.analyze_batch(ARTICLES)
+    assert ai.analyze_batch(ARTICLES) == first
+    assert client.calls == 1
+
+def test_partial_batch_answers_are_retried(analyzer):
+    client = BatchClient(('category',))
+    ai = analyzer(client)
+    result = ai.analyze_batch(ARTICLES)[0]
+    assert result['summary'] == FAILED_SUMMARY
+    assert result['sentiment']['failed']
+    assert result['category'] == 'Market'
+
+    ai.analyze_batch(ARTICLES)
+    assert client.calls == 2
@@ -0,0 +1,107 @@
+import time
+import threading
+from types import SimpleNamespace
+import pytest
+from utils.llm_scheduler import (
+    LLMScheduler, TokenBucket, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_PREFETCH
+)
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__('rate limited')
+        self.response = SimpleNamespace(headers=headers)
+
+def scheduler(**kwargs):
+    options = dict(requests_per_minute=60000, tokens_per_minute=10 ** 7, max_workers=1, max_retries=2)
+    options.update(kwargs)
+    return LLMScheduler(**options)
+
+def test_queued_jobs_run_in_priority_order():
+    llm = scheduler()
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def block():
+        started.set()
+        release.wait(2)
+
+    llm.submit(block)
+    assert started.wait(2)
+    futures = [
+        llm.submit(lambda name=name: order.append(name), priority=priority)
+        for name, priority in [
+            ('prefetch', PRIORITY_PREFETCH),
+            ('background', PRIORITY_BACKGROUND),
+            ('interactive-1', PRIORITY_INTERACTIVE),
+            ('interactive-2', PRIORITY_INTERACTIVE),
+        ]
+    ]
+    release.set()
+    for future in futures:
+        future.result(timeout=2)
+    assert order == ['interactive-1', 'interactive-2', 'background', 'prefetch']
+
+def test_retry_after_pauses_every_worker():
+    llm = scheduler(max_workers=2)
+    attempts = []
+
+    def rate_limited_once():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RateLimited({'retry-after': '0.3'})
+        return 'ok'
+
+    future = llm.submit(rate_limited_once)
+    deadline = time.monotonic() + 2
+    while llm.resume_at <= time.monotonic() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    resume_at = llm.resume_at
+
+    # A job queued during the pause waits for it too, even on the idle worker
+    other = llm.submit(time.monotonic)
+    assert other.result(timeout=2) >= resume_at
+    assert future.result(timeout=2) == 'ok'
+    assert attempts[1] - attempts[0] >= 0.29
+
+def test_retry_after_ms_and_http_date():
+    assert LLMScheduler._retry_after(SimpleNamespace(headers={'retry-after-ms': '250'})) == 0.25
+    assert LLMScheduler._retry_after(SimpleNamespace(headers={'retry-after': 'Thu, 01 Jan 1970 00:00:00 GMT'})) == 0.0
+    assert LLMScheduler._retry_after(SimpleNamespace(headers={})) is None
+
+def test_errors_that_are_not_retryable_fail_at_once():
+    llm = scheduler()
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        error = ValueError('bad request')
+        error.status_code = 400
+        raise error
+
+    with pytest.raises(ValueError):
+        llm.submit(bad_request).result(timeout=2)
+    assert len(calls) == 1
+
+def test_token_bucket_is_corrected_to_actual_usage():
+    # 60 tokens per minute: one per second, ten in the bucket to start with
+    llm = scheduler(tokens_per_minute=60)
+    response = SimpleNamespace(usage=SimpleNamespace(total_tokens=8))
+    assert llm.submit(lambda: response, tokens=3).result(timeout=2) is response
+    # 3 were reserved up front, and the 5 the estimate missed are taken afterwards
+    assert 2 <= llm.tokens.tokens < 2.5
+
+    llm = scheduler(tokens_per_minute=60)
+    response = SimpleNamespace(usage=SimpleNamespace(total_tokens=1))
+    llm.submit(lambda: response, tokens=6).result(timeout=2)
+    # Unused tokens of an over-estimate are returned
+    assert 9 <= llm.tokens.tokens <= 10
+
+def test_token_bucket_overdraft_becomes_a_wait():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.take(10) == 0.0
+    assert bucket.take(5) == pytest.approx(5.0, abs=0.05)
+    bucket.give(5)
+    assert bucket.take(0) == pytest.approx(0.0, abs=0.05)
@@ -0,0 +1,13 @@
+import pytest
+from utils.news_classifier import CATEGORY_KEYWORDS, NewsClassifier
+
+@pytest.mark.parametrize('category, keyword', [
+    (category, keyword) for category, weights in CATEGORY_KEYWORDS.items() for keyword in weights
+])
+def test_every_keyword_is_a_feature_the_tokenizer_can_produce(category, keyword):
+    assert keyword in NewsClassifier.features(keyword)
+
+def test_company_suffix_counts_towards_press_releases():
+    assert 'inc' in NewsClassifier.features('Acme Inc. Announces Partnership')
+    result = NewsClassifier(threshold=0.5).classify('Acme Inc. Announces Partnership')
+    assert result['category'] == 'Press Releases'
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from utils.price_history import PriceHistory, lttb_indices
+
+def series(n, seed=0):
+    random = np.random.default_rng(seed)
+    x = np.arange(n, dtype=np.int64) * 86400
+    y = np.cumsum(random.normal(size=n)).astype(np.float32) + 100
+    return x, y
+
+@pytest.mark.parametrize('n, threshold', [(10, 3), (100, 7), (1000, 300), (1001, 500), (5000, 4999)])
+def test_lttb_keeps_threshold_points_with_both_endpoints(n, threshold):
+    x, y = series(n)
+    indices = lttb_indices(x, y, threshold)
+    assert len(indices) == threshold
+    assert indices[0] == 0
+    assert indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+
+@pytest.mark.parametrize('threshold', [0, 2, 50, 60])
+def test_lttb_returns_every_point_when_nothing_to_drop(threshold):
+    x, y = series(50)
+    assert lttb_indices(x, y, threshold).tolist() == list(range(50))
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(1000, dtype=np.int64)
+    y = np.zeros(1000, dtype=np.float32)
+    y[437] = 50
+    assert 437 in lttb_indices(x, y, 20)
+
+def test_downsample_selects_whole_bars():
+    t, close = series(1000)
+    history = PriceHistory(t, close + 1, close + 2, close - 2, close, np.arange(1000))
+    downsampled = history.downsample(100)
+    assert len(downsampled) == 100
+    assert downsampled.t[0] == t[0] and downsampled.t[-1] == t[-1]
+    rows = (downsampled.t // 86400).astype(np.int64)
+    assert np.array_equal(downsampled.close, close[rows])
+    assert np.array_equal(downsampled.volume, np.arange(1000, dtype=np.float32)[rows])
+    assert history.downsample(1000) is history
@@ -0,0 +1,82 @@
+import time
+import threading
+from utils.quote_cache import QuoteCache
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+def test_concurrent_misses_share_one_load():
+    cache = QuoteCache(ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return {'price': 100.0}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('AAPL', loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert wait_until(lambda: cache.stats['misses'] + cache.stats['coalesced'] == 8)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'price': 100.0}] * 8
+    assert results[0] is results[-1]
+    assert cache.stats['misses'] == 1
+    assert cache.stats['coalesced'] == 7
+
+def test_failed_load_is_not_cached():
+    cache = QuoteCache(ttl=60)
+    assert cache.get_or_load('AAPL', lambda: None) is None
+    assert cache.get_or_load('AAPL', lambda: {'price': 1.0}) == {'price': 1.0}
+
+def test_loader_exception_is_returned_as_none_to_every_waiter():
+    cache = QuoteCache(ttl=60)
+
+    def loader():
+        raise RuntimeError('upstream down')
+
+    assert cache.get_or_load('AAPL', loader) is None
+    assert cache.inflight == {}
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = QuoteCache(ttl=0.05, stale_grace=10)
+    cache.get_or_load('AAPL', lambda: 'old')
+    time.sleep(0.06)
+
+    release = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        release.wait(2)
+        return 'new'
+
+    # Served immediately from the stale entry, however many readers arrive during the refresh
+    assert cache.get_or_load('AAPL', refresh) == 'old'
+    assert cache.get_or_load('AAPL', refresh) == 'old'
+    assert cache.stats['stale_hits'] == 2
+    assert cache.get('AAPL') is None
+
+    release.set()
+    assert wait_until(lambda: cache.get('AAPL') == 'new')
+    assert len(calls) == 1
+    assert cache.get_or_load('AAPL', refresh) == 'new'
+
+def test_entries_past_the_stale_grace_are_reloaded_inline():
+    cache = QuoteCache(ttl=0.02, stale_grace=0.02)
+    cache.get_or_load('AAPL', lambda: 'old')
+    time.sleep(0.05)
+    assert cache.get_or_load('AAPL', lambda: 'new') == 'new'
+    assert cache.stats['misses'] == 2
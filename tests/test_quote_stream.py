@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from utils.quote_stream import QuoteStream
+
+class Quotes:
+    """
+    Stock fetcher stand-in returning whatever prices the test sets
+    """
+
+    def __init__(self):
+        self.prices = {}
+        self.ticker_index = SimpleNamespace(resolve=lambda company: company.upper())
+
+    def get_live_quotes(self, symbols):
+        return {
+            symbol: {'price': self.prices[symbol], 'change': 0.0, 'change_percent': 0.0, 'volume': 1}
+            for symbol in symbols if symbol in self.prices
+        }
+
+def stream():
+    quotes = Quotes()
+    quote_stream = QuoteStream(quotes, interval=3600)
+    # Poll by hand only
+    quote_stream._start = lambda: None
+    return quotes, quote_stream
+
+def test_subscribers_get_only_changed_fields():
+    quotes, quote_stream = stream()
+    subscription = quote_stream.subscribe(['aapl'])
+    quotes.prices['AAPL'] = 100.0
+    quote_stream.poll_once()
+    assert subscription.queue.get_nowait()['aapl']['price'] == 100.0
+
+    quotes.prices['AAPL'] = 101.0
+    quote_stream.poll_once()
+    assert subscription.queue.get_nowait() == {'aapl': {'price': 101.0}}
+    quote_stream.poll_once()
+    assert subscription.queue.empty()
+
+def test_snapshot_discards_the_deltas_it_supersedes():
+    quotes, quote_stream = stream()
+    subscription = quote_stream.subscribe(['aapl'])
+    for price in (100.0, 101.0, 102.0):
+        quotes.prices['AAPL'] = price
+        quote_stream.poll_once()
+    assert subscription.queue.qsize() == 3
+
+    assert quote_stream.snapshot(subscription)['aapl']['price'] == 102.0
+    assert subscription.queue.empty()
+
+def test_slow_subscriber_is_resynced_instead_of_queueing_without_bound():
+    quotes, quote_stream = stream()
+    subscription = quote_stream.subscribe(['aapl'])
+    subscription.queue.maxsize = 2
+    for price in (100.0, 101.0, 102.0, 103.0):
+        quotes.prices['AAPL'] = price
+        quote_stream.poll_once()
+    assert subscription.resync
+
+    assert quote_stream.snapshot(subscription)['aapl']['price'] == 103.0
+    assert not subscription.resync
+    assert subscription.queue.empty()
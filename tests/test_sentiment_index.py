@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+import pytest
+from utils.sentiment_index import SentimentIndex, DAY
+from utils.ticker_index import TickerIndex
+
+# Monday 2024-01-01, in days since the epoch
+MONDAY = 19723
+# Two trading weeks of daily bars at 20:00 UTC; no bars on the weekend
+BAR_DAYS = [MONDAY + offset for offset in (0, 1, 2, 3, 4, 7, 8, 9, 10, 11)]
+BARS = [day * DAY + 20 * 3600 for day in BAR_DAYS]
+
+def article(url, day, hour=10):
+    published = datetime.fromtimestamp(day * DAY + hour * 3600, timezone.utc)
+    return {'url': url, 'title': url, 'publishedAt': published.strftime('%Y-%m-%d %H:%M')}
+
+@pytest.fixture
+def index(tmp_path):
+    index = SentimentIndex(str(tmp_path / 'sentiment.sqlite3'), ticker_index=TickerIndex())
+    index.record('Apple', [
+        article('monday', MONDAY),
+        article('wednesday', MONDAY + 2),
+        article('saturday', MONDAY + 5),
+    ], [
+        {'rating': 5, 'confidence': 1.0},   # score 1
+        {'rating': 1, 'confidence': 0.5},   # score -1
+        {'rating': 4, 'confidence': 1.0},   # score 0.5
+    ])
+    return index
+
+def test_days_without_news_have_no_daily_score(index):
+    series = index.aligned('Apple', BARS, window=3)
+    assert series['articles'] == [1, 0, 1, 0, 0, 1, 0, 0, 0, 0]
+    assert series['mean'] == [1.0, None, -1.0, None, None, 0.5, None, None, None, None]
+    assert series['weighted'] == series['mean']
+
+def test_rolling_carries_over_days_without_news_until_the_window_passes(index):
+    series = index.aligned('Apple', BARS, window=3)
+    # Wednesday combines Monday and Wednesday by confidence: (1 * 1 - 1 * 0.5) / 1.5;
+    # Saturday's article counts from the next Monday's bar
+    assert series['rolling'] == [1.0, 1.0, 0.3333, -1.0, -1.0, 0.5, None, None, None, None]
+
+def test_momentum_compares_with_the_previous_window(index):
+    series = index.aligned('Apple', BARS, window=3)
+    assert series['momentum'] == [None, None, None, -2.0, -2.0, 1.5, None, None, None, None]
+
+def test_volume_weighted_needs_volumes(index):
+    assert set(index.aligned('Apple', BARS, window=3)['volume_weighted']) == {None}
+    volumes = [100, 0, 300, 0, 0, 100, 0, 0, 0, 0]
+    series = index.aligned('Apple', BARS, window=3, volumes=volumes)
+    # Wednesday: Monday's score weighted by 100 and Wednesday's by 300
+    assert series['volume_weighted'][:6] == [1.0, 1.0, -0.5, -1.0, -1.0, 0.5]
+
+def test_company_names_and_tickers_share_one_history(index):
+    assert index.company_key('Apple Inc.') == index.company_key('AAPL') == 'AAPL'
+    assert index.aligned('AAPL', BARS, window=3) == index.aligned('Apple', BARS, window=3)
+    assert index.company_key('Some Private Startup') == 'some private startup'
+
+def test_recording_is_idempotent_and_skips_failed_sentiments(index):
+    assert index.record('AAPL', [article('monday', MONDAY)], [{'rating': 1, 'confidence': 1.0}]) == 0
+    assert index.record('Apple', [article('tuesday', MONDAY + 1)], [
+        {'rating': 3, 'confidence': 0.5, 'failed': True}
+    ]) == 0
+    assert index.record('Apple', [article('undated', MONDAY) | {'publishedAt': ''}], [
+        {'rating': 5, 'confidence': 1.0}
+    ]) == 0
+    assert index.aligned('Apple', BARS, window=3)['articles'][:2] == [1, 0]
+
+def test_empty_timestamps(index):
+    series = index.aligned('Apple', [], window=3)
+    assert all(values == [] for values in series.values())
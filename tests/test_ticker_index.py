@@ -0,0 +1,26 @@
+import pytest
+from utils.ticker_index import TickerIndex
+
+@pytest.fixture(scope='module')
+def index():
+    return TickerIndex()
+
+@pytest.mark.parametrize('query, ticker', [
+    ('Apple', 'AAPL'),
+    ('apple inc.', 'AAPL'),
+    ('aapl', 'AAPL'),
+    ('bofa', 'BAC'),
+    ('Nvid', 'NVDA'),
+    ('Amaz', 'AMZN'),
+    ('bank of', 'BAC'),
+])
+def test_names_aliases_symbols_and_prefixes(index, query, ticker):
+    assert index.resolve(query) == ticker
+
+@pytest.mark.parametrize('query', ['AI', 'BRK-B', 'PLTR'])
+def test_unlisted_ticker_shaped_input_passes_through(index, query):
+    assert index.resolve(query) == query
+
+@pytest.mark.parametrize('query', ['a', 'Co', 'Bank', 'zzzz', ''])
+def test_short_generic_and_unknown_queries_do_not_resolve(index, query):
+    assert index.resolve(query) is None
@@ -1,110 +1,688 @@
 import os
-from openai import OpenAI
 import json
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from utils.analysis_cache import AnalysisCache
+from utils.concurrency import get_executor, map_bounded
+from utils.news_classifier import CATEGORIES, NewsClassifier
+from utils.llm_scheduler import PRIORITY_INTERACTIVE, get_scheduler
+from utils import metrics
+
+DEFAULT_CATEGORY = "Technology"
+DEFAULT_SENTIMENT = {"rating": 3, "confidence": 0.5}
+# Returned in place of a sentiment the model did not provide; 'failed' tells it apart from a real neutral answer
+FAILED_SENTIMENT = dict(DEFAULT_SENTIMENT, failed=True)
+NO_CONTENT_SUMMARY = "No content available to summarize."
+FAILED_SUMMARY = "Unable to generate summary at this time."
+UNAVAILABLE_SUMMARY = "AI analysis is not configured."
+
+DEFAULT_MODEL = "gpt-4"
+# Smaller, faster model for tasks with short structured answers
+DEFAULT_SMALL_MODEL = "gpt-4o-mini"
+TASKS = ('summary', 'batch', 'category', 'sentiment')
+
+SUMMARY_PROMPT = """You are a professional news summarizer. Create a concise, informative 
+                        summary of the following news article in 2-3 sentences. Focus on the key points 
+                        and maintain factual accuracy."""
+
+CHUNK_PROMPT = """You are a professional news summarizer. Summarize this part of a longer news 
+                        article in 2-3 sentences, keeping names, figures and dates exact."""
+
+REDUCE_PROMPT = """You are a professional news summarizer. You receive summaries of consecutive 
+                        parts of one news article. Combine them into a concise, informative summary of the 
+                        whole article in 2-3 sentences. Focus on the key points and maintain factual accuracy."""
+
+CATEGORY_PROMPT = """Categorize the following news title into one of these categories: 
+                        Technology, Market, or Press Releases. Consider the content and context carefully. 
+                        Respond in JSON format with a 'category' field."""
+
+SENTIMENT_PROMPT = """Analyze the sentiment of the news article and provide a rating 
+                        from 1 to 5 stars (1 being very negative, 5 being very positive) and a 
+                        confidence score between 0 and 1. Consider the overall tone, facts presented, 
+                        and implications. Respond with JSON in this format: 
+                        {'rating': number, 'confidence': number}"""
+
+BATCH_PROMPT = """You are a professional financial news analyst. For each article in the 
+                        JSON list you receive, write a concise, factual 2-3 sentence summary of the description, 
+                        rate its sentiment from 1 to 5 stars (1 being very negative, 5 being very positive) with 
+                        a confidence score between 0 and 1, and categorize its title as one of: Technology, 
+                        Market, or Press Releases. Respond with JSON in this format: 
+                        {'articles': [{'id': number, 'summary': string, 
+                        'sentiment': {'rating': number, 'confidence': number}, 'category': string}]}"""
 
 class AIAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None, max_concurrency=None, call_timeout=None, classifier=None, client=None,
+                 scheduler=None, models=None, escalation_model=None):
+        self.max_concurrency = max_concurrency or int(os.environ.get('AI_MAX_CONCURRENCY', 5))
+        self.call_timeout = call_timeout or float(os.environ.get('AI_CALL_TIMEOUT', 20))
+        # Longest a request may wait for the scheduler, including rate-limit pauses and retries
+        self.queue_timeout = float(os.environ.get('AI_QUEUE_TIMEOUT', 60))
+        # Every OpenAI request goes through one process-wide queue with shared rate limits
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        # client: anything with the OpenAI client's chat.completions.create(), e.g. a benchmark fake.
+        # The OpenAI client is only built on first use; without a key, analysis returns defaults.
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.enabled = client is not None or bool(os.environ.get('OPENAI_API_KEY'))
+        # Per-task models, overridable with AI_MODEL_<TASK>. Summaries (alone or in a batch)
+        # use the large model; categories and sentiment use the small one and are re-asked
+        # of escalation_model when the answer is invalid or not confident enough.
+        self.model = os.environ.get('AI_MODEL', DEFAULT_MODEL)
+        small_model = os.environ.get('AI_SMALL_MODEL', DEFAULT_SMALL_MODEL)
+        defaults = {'summary': self.model, 'batch': self.model, 'category': small_model, 'sentiment': small_model}
+        self.models = {task: os.environ.get(f'AI_MODEL_{task.upper()}', defaults[task]) for task in TASKS}
+        self.models.update(models or {})
+        self.escalation_model = escalation_model or os.environ.get('AI_MODEL_ESCALATION', self.model)
+        self.escalation_confidence = float(os.environ.get('AI_ESCALATION_CONFIDENCE', 0.6))
+        # Article text beyond this many (estimated) tokens is cut before sending, except for
+        # summaries, which split it into up to max_chunks chunks of that size (map-reduce)
+        self.max_input_tokens = int(os.environ.get('AI_MAX_INPUT_TOKENS', 512))
+        self.max_chunks = int(os.environ.get('AI_MAX_CHUNKS', 8))
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.classifier = classifier if classifier is not None else NewsClassifier()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        from openai import OpenAI
+        from utils.http_clients import openai_http_client
+
         api_key = os.environ.get('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key not found in environment variables")
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4"  # Using standard GPT-4 model
+        # Keep-alive pool sized for the analyzer's concurrency, so calls reuse TLS connections.
+        # Retries are left to the scheduler, which knows about the shared rate limits.
+        return OpenAI(
+            api_key=api_key,
+            timeout=self.call_timeout,
+            max_retries=0,
+            http_client=openai_http_client(pool_size=self.max_concurrency * 2, timeout=self.call_timeout)
+        )
 
-    def summarize_news(self, text):
+    def summarize_news(self, text, priority=PRIORITY_INTERACTIVE):
         """
         Generate a concise summary of the news article
         """
         if not text or not isinstance(text, str):
-            return "No content available to summarize."
+            return NO_CONTENT_SUMMARY
 
         try:
             cleaned_text = text.strip()
             if not cleaned_text:
-                return "No content available to summarize."
+                return NO_CONTENT_SUMMARY
+            if not self.enabled:
+                return UNAVAILABLE_SUMMARY
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            key = self.cache.make_key(self.models['summary'], SUMMARY_PROMPT, cleaned_text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            prompt, content = self._summary_input(cleaned_text, priority)
+            response = self._complete(
+                'summary',
+                priority,
+                self.models['summary'],
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a professional news summarizer. Create a concise, informative 
-                        summary of the following news article in 2-3 sentences. Focus on the key points 
-                        and maintain factual accuracy."""
-                    },
-                    {"role": "user", "content": cleaned_text}
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": content}
                 ],
                 max_tokens=150,
                 temperature=0.7
             )
 
             if not response.choices or not response.choices[0].message:
-                return "Error: Unable to generate summary"
+                return FAILED_SUMMARY
 
-            return response.choices[0].message.content.strip()
+            summary = response.choices[0].message.content.strip()
+            self.cache.set(key, summary)
+            return summary
 
         except Exception as e:
             print(f"Error in summarize_news: {str(e)}")
-            return str(e) if str(e) else "Unable to generate summary at this time."
+            metrics.inc('fallbacks_total', operation='summarize_news')
+            return FAILED_SUMMARY
 
-    def categorize_news(self, text):
+    def summarize_news_stream(self, text, priority=PRIORITY_INTERACTIVE):
         """
-        Categorize news into Technology, Market, or Press Releases
+        Generate the same summary as summarize_news, yielding text chunks as the model produces them
         """
-        if not text or not isinstance(text, str):
-            return {"category": "Technology"}
+        if not text or not isinstance(text, str) or not text.strip():
+            yield NO_CONTENT_SUMMARY
+            return
+        if not self.enabled:
+            yield UNAVAILABLE_SUMMARY
+            return
+
+        cleaned_text = text.strip()
+        key = self.cache.make_key(self.models['summary'], SUMMARY_PROMPT, cleaned_text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
 
+        parts = []
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # For long texts only the final combining step is streamed
+            prompt, content = self._summary_input(cleaned_text, priority)
+            stream = self._request(
+                'llm_summary_stream',
+                priority,
+                self.models['summary'],
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """Categorize the following news title into one of these categories: 
-                        Technology, Market, or Press Releases. Consider the content and context carefully. 
-                        Respond in JSON format with a 'category' field."""
-                    },
-                    {"role": "user", "content": text.strip()}
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": content}
                 ],
-                response_format={"type": "json_object"}
+                max_tokens=150,
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True}
             )
 
-            result = json.loads(response.choices[0].message.content)
-            return result if 'category' in result else {"category": "Technology"}
+            with metrics.timed('upstream_request_seconds', operation='llm_summary_stream_body'):
+                for chunk in stream:
+                    if chunk.usage is not None:
+                        self._record_usage('summary', chunk.usage, self.models['summary'])
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield parts[-1]
 
         except Exception as e:
-            print(f"Error in categorize_news: {str(e)}")
-            return {"category": "Technology"}
+            print(f"Error in summarize_news_stream: {str(e)}")
+            if not parts:
+                metrics.inc('fallbacks_total', operation='summarize_news_stream')
+                yield FAILED_SUMMARY
+            return
+
+        summary = ''.join(parts).strip()
+        if summary:
+            self.cache.set(key, summary)
 
-    def analyze_sentiment(self, text):
+    def _summary_input(self, text, priority):
         """
-        Analyze the sentiment of the news article
+        Return the (system prompt, user content) of the request that produces text's summary.
+        Text longer than one chunk is mapped first: its chunks are summarized in parallel and
+        the final request combines those partial summaries.
         """
-        if not text or not isinstance(text, str):
-            return {"rating": 3, "confidence": 0.5}
+        chunks = self._chunks(text)
+        if len(chunks) == 1:
+            return SUMMARY_PROMPT, chunks[0]
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+        model = self.models['summary']
+        futures = [
+            self._submit(
+                'llm_summary_map',
+                priority,
+                model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """Analyze the sentiment of the news article and provide a rating 
-                        from 1 to 5 stars (1 being very negative, 5 being very positive) and a 
-                        confidence score between 0 and 1. Consider the overall tone, facts presented, 
-                        and implications. Respond with JSON in this format: 
-                        {'rating': number, 'confidence': number}"""
-                    },
-                    {"role": "user", "content": text.strip()}
+                    {"role": "system", "content": CHUNK_PROMPT},
+                    {"role": "user", "content": chunk}
                 ],
-                response_format={"type": "json_object"}
+                max_tokens=150,
+                temperature=0.3
             )
+            for chunk in chunks
+        ]
+        partials = []
+        for future in futures:
+            try:
+                response = self._result(future, 'llm_summary_map')
+            except Exception as e:
+                # The other parts still make a useful summary
+                print(f"Error summarizing article chunk: {str(e)}")
+                continue
+            if response.usage is not None:
+                self._record_usage('summary', response.usage, model)
+            if response.choices and response.choices[0].message.content:
+                partials.append(response.choices[0].message.content.strip())
+        if not partials:
+            raise ValueError("No chunk of the article could be summarized")
+        return REDUCE_PROMPT, '\n\n'.join(partials)
 
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "rating": max(1, min(5, round(result.get("rating", 3)))),
-                "confidence": max(0, min(1, result.get("confidence", 0.5)))
-            }
+    def _chunks(self, text):
+        """
+        Split text into at most max_chunks chunks of about max_input_tokens tokens, at paragraph
+        or word boundaries. Text past the last chunk is dropped; news puts the substance first.
+        """
+        size = self.max_input_tokens * 4
+        chunks = []
+        while len(text) > size and len(chunks) < self.max_chunks - 1:
+            cut = text.rfind('\n', size // 2, size)
+            if cut < 0:
+                cut = text.rfind(' ', size // 2, size)
+            if cut < 0:
+                cut = size
+            chunks.append(text[:cut].strip())
+            text = text[cut:].strip()
+        chunks.append(self._trim(text))
+        return chunks
+
+    def categorize_news(self, text, priority=PRIORITY_INTERACTIVE):
+        """
+        Categorize news into Technology, Market, or Press Releases.
+        Clear cases are handled by the local classifier; only titles it is not
+        confident about are sent to the LLM.
+        """
+        if not text or not isinstance(text, str):
+            return {"category": DEFAULT_CATEGORY}
+
+        local = self.classifier.classify(text)
+        if self.classifier.is_confident(local) or not self.enabled:
+            metrics.inc('classifications_total', source='local')
+            return dict(local, source="local")
+
+        metrics.inc('classifications_total', source='llm')
+        return dict(self.categorize_news_llm(text, priority), source="llm")
+
+    def categorize_local(self, text):
+        """
+        Category from the local classifier alone, and whether categorize_news would also ask the LLM
+        (then categorize_news_llm gives the final answer)
+        """
+        if not text or not isinstance(text, str):
+            return DEFAULT_CATEGORY, False
+        local = self.classifier.classify(text)
+        if self.classifier.is_confident(local) or not self.enabled:
+            metrics.inc('classifications_total', source='local')
+            return local['category'], False
+        return local['category'], True
+
+    def categorize_concurrent(self, texts, priority=PRIORITY_INTERACTIVE):
+        """
+        Categorize several titles like categorize_news; the ones the local classifier is not
+        confident about go to the LLM in parallel, falling back to the default category if
+        not answered within call_timeout
+        """
+        if not self.enabled:
+            return [self.categorize_news(text) for text in texts]
+
+        results = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            local = self.classifier.classify(text) if text and isinstance(text, str) else None
+            if local is None:
+                results[index] = {"category": DEFAULT_CATEGORY}
+            elif self.classifier.is_confident(local):
+                metrics.inc('classifications_total', source='local')
+                results[index] = dict(local, source="local")
+            else:
+                pending.append(index)
+
+        if pending:
+            metrics.inc('classifications_total', len(pending), source='llm')
+            executor = get_executor('ai-analyzer', self.max_concurrency)
+            answers = map_bounded(
+                lambda index: dict(self.categorize_news_llm(texts[index], priority), source="llm"),
+                pending,
+                executor,
+                timeout=self.call_timeout,
+                default=lambda index: {"category": DEFAULT_CATEGORY, "source": "llm"}
+            )
+            for index, answer in zip(pending, answers):
+                results[index] = answer
+        return results
+
+    def category_from_analysis(self, title, analysis):
+        """
+        Category for an article that has already been through analyze_batch/analyze_concurrent:
+        the local classifier's when it is confident (as categorize_news would answer), else the
+        one the analysis returned, so no separate categorization request is needed.
+        If the analysis failed, the local classifier's best guess is used.
+        """
+        if title and isinstance(title, str):
+            local = self.classifier.classify(title)
+            failed = analysis.get('partial') or analysis.get('summary') == FAILED_SUMMARY
+            if self.classifier.is_confident(local) or not self.enabled or failed:
+                return local['category']
+        return analysis.get('category', DEFAULT_CATEGORY)
+
+    def categorize_news_llm(self, text, priority=PRIORITY_INTERACTIVE):
+        """
+        Categorize news with the LLM only
+        """
+        if not self.enabled:
+            return {"category": DEFAULT_CATEGORY}
+
+        try:
+            text = self._trim(text.strip())
+            key = self.cache.make_key(self.models['category'], CATEGORY_PROMPT, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            category = self._request_category(text, priority, self.models['category'])
+            if category is None and self._escalate('category', 'invalid_response'):
+                category = self._request_category(text, priority, self.escalation_model)
+            if category is None:
+                return {"category": DEFAULT_CATEGORY}
+            result = {"category": category}
+            self.cache.set(key, result)
+            return result
+
+        except Exception as e:
+            print(f"Error in categorize_news: {str(e)}")
+            metrics.inc('fallbacks_total', operation='categorize_news')
+            return {"category": DEFAULT_CATEGORY}
+
+    def _request_category(self, text, priority, model):
+        """
+        Ask model for a category; returns None if the answer is not valid JSON or not a known category
+        """
+        response = self._complete(
+            'category',
+            priority,
+            model,
+            messages=[
+                {"role": "system", "content": CATEGORY_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            response_format={"type": "json_object"}
+        )
+        result = self._json_object(response)
+        category = result.get('category') if result else None
+        return category if category in CATEGORIES else None
+
+    def analyze_sentiment(self, text, priority=PRIORITY_INTERACTIVE):
+        """
+        Analyze the sentiment of the news article.
+        Returns FAILED_SENTIMENT ('failed': True) when there is no answer from the model.
+        """
+        if not text or not isinstance(text, str) or not self.enabled:
+            return dict(FAILED_SENTIMENT)
+
+        try:
+            text = self._trim(text.strip())
+            key = self.cache.make_key(self.models['sentiment'], SENTIMENT_PROMPT, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            result = self._request_sentiment(text, priority, self.models['sentiment'])
+            if result is None:
+                reason = 'invalid_response'
+            elif result['confidence'] < self.escalation_confidence:
+                reason = 'low_confidence'
+            else:
+                reason = None
+            if reason and self._escalate('sentiment', reason):
+                result = self._request_sentiment(text, priority, self.escalation_model) or result
+            if result is None:
+                raise ValueError("Invalid sentiment response")
+            self.cache.set(key, result)
+            return result
 
         except Exception as e:
             print(f"Error in analyze_sentiment: {str(e)}")
-            return {"rating": 3, "confidence": 0.5}
\ No newline at end of file
+            metrics.inc('fallbacks_total', operation='analyze_sentiment')
+            return dict(FAILED_SENTIMENT)
+
+    def _request_sentiment(self, text, priority, model):
+        """
+        Ask model for a sentiment rating; returns None if the answer is not a JSON object
+        """
+        response = self._complete(
+            'sentiment',
+            priority,
+            model,
+            messages=[
+                {"role": "system", "content": SENTIMENT_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            response_format={"type": "json_object"}
+        )
+        result = self._json_object(response)
+        return self._parse_sentiment(result) if result is not None else None
+
+    def analyze_article(self, text, title=None, priority=PRIORITY_INTERACTIVE):
+        """
+        Summarize, score and categorize a single news article in one request
+        """
+        return self.analyze_batch([{'title': title, 'description': text}], priority)[0]
+
+    def analyze_batch(self, articles, priority=PRIORITY_INTERACTIVE):
+        """
+        Summarize, score and categorize several news articles in one request.
+        Returns a list of {'summary', 'sentiment', 'category'} dicts in article order.
+        Articles already in the cache are not sent to the model. An article's full text
+        ('content') is used when it has one; texts longer than one chunk are summarized by
+        map-reduce first and that summary stands in for them in the batch request.
+        """
+        results = [self._default_analysis(article) for article in articles]
+        if not self.enabled:
+            return results
+
+        payload = []
+        keys = {}
+        summaries = {}
+        for index, article in enumerate(articles):
+            title = self._clean(article.get('title'))
+            text = self.article_text(article)
+            if not title and not text:
+                continue
+
+            key = self.cache.make_key(self.models['batch'], BATCH_PROMPT, f"{title}\n{text}")
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = cached
+                continue
+
+            if len(text) > self.max_input_tokens * 4:
+                summary = self.summarize_news(text, priority)
+                if summary != FAILED_SUMMARY:
+                    summaries[index] = summary
+                    text = summary
+            keys[index] = key
+            payload.append({"id": index, "title": title, "description": self._trim(text)})
+
+        if not payload:
+            return results
+
+        try:
+            result = self._request_batch(payload, priority, self.models['batch'])
+            if result is None and self._escalate('batch', 'invalid_response'):
+                result = self._request_batch(payload, priority, self.escalation_model)
+            if result is None:
+                raise ValueError("Invalid batch response")
+
+            for item in result.get('articles', []):
+                if not isinstance(item, dict):
+                    continue
+                index = item.get('id')
+                if index in keys:
+                    results[index] = self._parse_analysis(item, results[index])
+                    if index in summaries:
+                        results[index]['summary'] = summaries[index]
+                    if self._is_complete(results[index]):
+                        self.cache.set(keys[index], results[index])
+                        del keys[index]
+
+            if keys:
+                # Articles the model left out, or answered only in part, keep their defaults for the
+                # missing fields and stay uncached so the next request retries them
+                metrics.inc('fallbacks_total', len(keys), operation='analyze_batch')
+
+        except Exception as e:
+            print(f"Error in analyze_batch: {str(e)}")
+            metrics.inc('fallbacks_total', operation='analyze_batch')
+
+        return results
+
+    def _request_batch(self, payload, priority, model):
+        response = self._complete(
+            'batch',
+            priority,
+            model,
+            messages=[
+                {"role": "system", "content": BATCH_PROMPT},
+                {"role": "user", "content": json.dumps(payload)}
+            ],
+            max_tokens=200 * len(payload),
+            response_format={"type": "json_object"}
+        )
+        return self._json_object(response)
+
+    def analyze_concurrent(self, articles, priority=PRIORITY_INTERACTIVE):
+        """
+        Analyze each article with its own request, running up to max_concurrency requests
+        in parallel. Articles not analyzed within call_timeout come back with default values
+        and 'partial': True rather than delaying the others.
+        """
+        if not self.enabled:
+            return [self._default_analysis(article) for article in articles]
+
+        executor = get_executor('ai-analyzer', self.max_concurrency)
+        return map_bounded(
+            lambda article: self.analyze_article(self.article_text(article), article.get('title'), priority),
+            articles,
+            executor,
+            timeout=self.call_timeout,
+            default=self._partial_analysis
+        )
+
+    def _partial_analysis(self, article):
+        metrics.inc('fallbacks_total', operation='analyze_concurrent')
+        return dict(self._default_analysis(article), partial=True)
+
+    def _complete(self, task, priority, model, **kwargs):
+        """
+        Run one chat completion, recording its latency and token usage
+        """
+        response = self._request(f'llm_{task}', priority, model, **kwargs)
+        if response.usage is not None:
+            self._record_usage(task, response.usage, model)
+        return response
+
+    def _request(self, operation, priority, model, **kwargs):
+        """
+        Queue one chat completion on the shared scheduler and wait for its response
+        """
+        return self._result(self._submit(operation, priority, model, **kwargs), operation)
+
+    def _submit(self, operation, priority, model, **kwargs):
+        """
+        Queue one chat completion on the shared scheduler; returns a Future for the response
+        """
+        def call():
+            with metrics.timed('upstream_request_seconds', operation=operation, model=model):
+                return self.client.chat.completions.create(model=model, **kwargs)
+
+        return self.scheduler.submit(call, priority=priority, tokens=self._estimate_tokens(kwargs))
+
+    def _result(self, future, operation):
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise TimeoutError(f"{operation} not scheduled within {self.queue_timeout}s")
+
+    @staticmethod
+    def _estimate_tokens(kwargs):
+        # About four characters per token for English, plus the completion budget
+        prompt = sum(len(message['content']) for message in kwargs.get('messages', []))
+        return prompt // 4 + kwargs.get('max_tokens', 300)
+
+    def _escalate(self, task, reason):
+        """
+        True if task's answer should be re-asked of the escalation model, counting the escalation
+        """
+        if self.models[task] == self.escalation_model:
+            return False
+        metrics.inc('llm_escalations_total', task=task, reason=reason)
+        return True
+
+    @staticmethod
+    def _json_object(response):
+        """
+        Parse a JSON-mode response, returning None unless it is a JSON object
+        """
+        try:
+            result = json.loads(response.choices[0].message.content)
+        except (IndexError, TypeError, ValueError):
+            return None
+        return result if isinstance(result, dict) else None
+
+    def _trim(self, text):
+        """
+        Cut text to about max_input_tokens tokens (four characters each), at a word boundary
+        """
+        limit = self.max_input_tokens * 4
+        if len(text) <= limit:
+            return text
+        return text[:limit].rsplit(' ', 1)[0] + '…'
+
+    @staticmethod
+    def _record_usage(task, usage, model):
+        metrics.inc('llm_tokens_total', usage.prompt_tokens, task=task, kind='prompt', model=model)
+        metrics.inc('llm_tokens_total', usage.completion_tokens, task=task, kind='completion', model=model)
+
+    @staticmethod
+    def _clean(text):
+        return text.strip() if isinstance(text, str) else ''
+
+    @staticmethod
+    def scored_sentiment(analysis):
+        """
+        The sentiment of an analyze_batch result, or None if it is a placeholder rather than the model's answer
+        """
+        sentiment = analysis.get('sentiment')
+        return None if not sentiment or sentiment.get('failed') else sentiment
+
+    @classmethod
+    def article_text(cls, article):
+        """
+        The text to analyze for an article: its extracted full text, else the NewsAPI description
+        """
+        return cls._clean(article.get('content')) or cls._clean(article.get('description'))
+
+    def _default_analysis(self, article):
+        if not self.article_text(article):
+            summary = NO_CONTENT_SUMMARY
+        else:
+            summary = FAILED_SUMMARY if self.enabled else UNAVAILABLE_SUMMARY
+        return {
+            "summary": summary,
+            "sentiment": dict(FAILED_SENTIMENT),
+            "category": DEFAULT_CATEGORY
+        }
+
+    @staticmethod
+    def _is_complete(analysis):
+        """
+        True if both the summary and the sentiment of an analysis came from the model
+        """
+        placeholders = (NO_CONTENT_SUMMARY, FAILED_SUMMARY, UNAVAILABLE_SUMMARY)
+        return analysis['summary'] not in placeholders and not analysis['sentiment'].get('failed')
+
+    def _parse_analysis(self, item, default):
+        """
+        Merge one article of a combined response over its defaults, field by field
+        """
+        summary = item.get('summary')
+        category = item.get('category')
+        sentiment = item.get('sentiment')
+        return {
+            "summary": summary.strip() if isinstance(summary, str) and summary.strip() else default['summary'],
+            "sentiment": self._parse_sentiment(sentiment) if isinstance(sentiment, dict) else default['sentiment'],
+            "category": category if category in CATEGORIES else default['category']
+        }
+
+    @staticmethod
+    def _parse_sentiment(result):
+        """
+        Clamp a model-provided rating to 1-5 and confidence to 0-1, defaulting missing fields
+        """
+        try:
+            rating = max(1, min(5, round(float(result.get("rating", DEFAULT_SENTIMENT["rating"])))))
+        except (TypeError, ValueError):
+            rating = DEFAULT_SENTIMENT["rating"]
+        try:
+            confidence = max(0, min(1, float(result.get("confidence", DEFAULT_SENTIMENT["confidence"]))))
+        except (TypeError, ValueError):
+            confidence = DEFAULT_SENTIMENT["confidence"]
+        return {"rating": rating, "confidence": confidence}
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from utils import metrics
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'analysis.sqlite3')
+
+class AnalysisCache:
+    """
+    Two-tier cache for AI analysis results: an in-process LRU in front of a SQLite store.
+    Entries are keyed by a hash of (model, prompt template, normalized text).
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_memory_entries=1024, max_disk_entries=50000,
+                 evict_every=100):
+        self.path = path or os.environ.get('ANALYSIS_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.evict_every = evict_every
+        self.writes = 0
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self.db = self._connect()
+
+    def _connect(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS analysis (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS analysis_created ON analysis (created)")
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            # Fall back to the in-memory tier only
+            print(f"Error opening analysis cache at {self.path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def make_key(model, prompt, text):
+        """
+        Hash the model, prompt template and whitespace/case-normalized text into a cache key
+        """
+        normalized = ' '.join(text.split()).lower() if isinstance(text, str) else json.dumps(text, sort_keys=True)
+        digest = hashlib.sha256()
+        for part in (model, prompt, normalized):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None on a miss
+        """
+        with metrics.timed('cache_lookup_seconds', cache='analysis'):
+            return self._get(key)
+
+    def _get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created < self.ttl:
+                    self.memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    metrics.inc('cache_requests_total', cache='analysis', result='memory_hit')
+                    return value
+                del self.memory[key]
+
+            if self.db is not None:
+                try:
+                    row = self.db.execute(
+                        "SELECT value, created FROM analysis WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Error reading analysis cache: {str(e)}")
+                    row = None
+                if row and now - row[1] < self.ttl:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.stats['disk_hits'] += 1
+                    metrics.inc('cache_requests_total', cache='analysis', result='disk_hit')
+                    return value
+
+            self.stats['misses'] += 1
+            metrics.inc('cache_requests_total', cache='analysis', result='miss')
+            return None
+
+    def set(self, key, value):
+        """
+        Store a JSON-serializable value in both tiers
+        """
+        now = time.time()
+        with self.lock:
+            self._remember(key, now, value)
+            if self.db is None:
+                return
+            try:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO analysis (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now)
+                )
+                self.db.commit()
+                self.writes += 1
+                if self.writes % self.evict_every == 0:
+                    self._evict_disk(now)
+            except sqlite3.Error as e:
+                print(f"Error writing analysis cache: {str(e)}")
+
+    def _remember(self, key, created, value):
+        self.memory[key] = (created, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self.db.execute("DELETE FROM analysis WHERE created < ?", (now - self.ttl,))
+        count = self.db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+        if count > self.max_disk_entries:
+            self.db.execute(
+                "DELETE FROM analysis WHERE key IN "
+                "(SELECT key FROM analysis ORDER BY created LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+        self.db.commit()
@@ -0,0 +1,203 @@
+import os
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import BrokenExecutor, TimeoutError as FutureTimeout
+from utils.concurrency import get_executor, map_bounded
+from utils import metrics
+
+# Pages larger than this are not parsed; real article pages are far smaller
+MAX_PAGE_BYTES = 3 * 1024 * 1024
+
+# Some news sites refuse requests' default user agent
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; MDFinance/1.0)',
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.5',
+}
+
+def extract_text(html, url):
+    """
+    Main text of an article page (HTML as bytes or str), without navigation, comments and
+    boilerplate. Runs in the extraction worker processes.
+    """
+    import trafilatura
+
+    return trafilatura.extract(
+        html, url=url, include_comments=False, include_tables=False, favor_precision=True
+    ) or ''
+
+class ArticleExtractor:
+    """
+    Full-text stage after NewsFetcher, which only gets NewsAPI's truncated descriptions.
+    Article pages are downloaded concurrently over one pooled session, at most per_host at a
+    time from any one site, and parsed with trafilatura in a process pool, since extraction
+    is CPU-bound and would otherwise hold the GIL. Extracted texts are kept in the news store
+    by URL; pages that fail or have no extractable text are not stored and are tried again
+    the next time they are needed.
+    """
+
+    def __init__(self, store, session=None, max_workers=None, per_host=None, timeout=None, processes=None):
+        self.store = store
+        self.enabled = os.environ.get('ARTICLE_EXTRACTION_ENABLED', '1') != '0'
+        self.max_workers = max_workers or int(os.environ.get('EXTRACT_MAX_CONCURRENCY', 8))
+        self.per_host = per_host or int(os.environ.get('EXTRACT_PER_HOST', 2))
+        # Longest extract() waits for downloads and parsing together; slower pages are retried next time
+        self.timeout = timeout or float(os.environ.get('EXTRACT_TIMEOUT', 10))
+        self.processes = processes or int(os.environ.get('EXTRACT_PROCESSES', min(4, os.cpu_count() or 1)))
+        self._session = session
+        self._pool = None
+        self.hosts = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            from utils.http_clients import PooledSession
+
+            with self.lock:
+                if self._session is None:
+                    session = PooledSession(
+                        pool_size=self.per_host,
+                        timeout=float(os.environ.get('EXTRACT_HTTP_TIMEOUT', 5)),
+                        retries=1
+                    )
+                    session.headers.update(HEADERS)
+                    self._session = session
+        return self._session
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            with self.lock:
+                if self._pool is None:
+                    # Workers must not be forked from a process that is running threads
+                    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.processes, mp_context=multiprocessing.get_context(method)
+                    )
+        return self._pool
+
+    def with_full_text(self, articles):
+        """
+        Set 'content' on each article to its extracted full text, or '' if there is none
+        """
+        texts = self.extract([article['url'] for article in articles if article.get('url')])
+        for article in articles:
+            article['content'] = texts.get(article.get('url')) or ''
+        return articles
+
+    def with_stored_text(self, articles):
+        """
+        Like with_full_text, but without waiting: articles get the text already in the store,
+        else '' (so analysis uses their description), and the rest are extracted in the
+        background for later requests
+        """
+        urls = [article['url'] for article in articles if article.get('url')]
+        texts = self.store.get_texts(urls)
+        metrics.inc('cache_requests_total', len(texts), cache='article_text', result='hit')
+        self.extract_later([url for url in urls if url not in texts])
+        for article in articles:
+            article['content'] = texts.get(article.get('url')) or ''
+        return articles
+
+    def extract_later(self, urls):
+        """
+        Queue extraction of urls on a background thread, skipping ones already queued
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            urls = [url for url in dict.fromkeys(urls) if url not in self.pending]
+            self.pending.update(urls)
+        if urls:
+            get_executor('article-extractor-background', 1).submit(self._extract_pending, urls)
+
+    def _extract_pending(self, urls):
+        try:
+            self.extract(urls)
+        except Exception as e:
+            print(f"Error in extract_later: {str(e)}")
+        finally:
+            with self.lock:
+                self.pending.difference_update(urls)
+
+    def extract(self, urls):
+        """
+        Return {url: full text} for urls, extracting the ones not in the store yet.
+        Pages that failed, have no text, or are still downloading or parsing after
+        timeout seconds are left out.
+        """
+        urls = list(dict.fromkeys(urls))
+        texts = self.store.get_texts(urls)
+        missing = [url for url in urls if url not in texts]
+        metrics.inc('cache_requests_total', len(urls) - len(missing), cache='article_text', result='hit')
+        if not missing or not self.enabled:
+            return texts
+
+        metrics.inc('cache_requests_total', len(missing), cache='article_text', result='miss')
+        executor = get_executor('article-extractor', self.max_workers)
+        extracted = {
+            url: text
+            for url, text in zip(missing, map_bounded(self._extract_one, missing, executor, timeout=self.timeout))
+            if text
+        }
+        if extracted:
+            self.store.save_texts(extracted)
+        texts.update(extracted)
+        return texts
+
+    def _extract_one(self, url):
+        html = self._download(url)
+        if not html:
+            return ''
+        future = self.pool.submit(extract_text, html, url)
+        try:
+            with metrics.timed('extract_seconds'):
+                return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            return None
+        except BrokenExecutor:
+            # A worker died, e.g. on a pathological page; start a fresh pool for the next one
+            with self.lock:
+                self._pool = None
+            raise
+
+    def _download(self, url):
+        """
+        Fetch an article page; returns its raw HTML bytes, or None if it is not an HTML page
+        or is larger than MAX_PAGE_BYTES. The body is streamed and abandoned once over the limit.
+        """
+        with self._host_slot(url):
+            with metrics.timed('upstream_request_seconds', operation='article_page'):
+                response = self.session.get(url, stream=True)
+                try:
+                    content_type = response.headers.get('Content-Type', '')
+                    if not response.ok or 'html' not in content_type:
+                        return None
+                    if int(response.headers.get('Content-Length') or 0) > MAX_PAGE_BYTES:
+                        return None
+                    chunks = []
+                    size = 0
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        size += len(chunk)
+                        if size > MAX_PAGE_BYTES:
+                            return None
+                        chunks.append(chunk)
+                    return b''.join(chunks)
+                finally:
+                    response.close()
+
+    def _host_slot(self, url):
+        """
+        Semaphore limiting concurrent downloads from url's host
+        """
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            slot = self.hosts.get(host)
+            if slot is None:
+                slot = self.hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
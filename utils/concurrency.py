@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_executor(name, max_workers):
+    """
+    Return a process-wide thread pool shared by everything using the same name,
+    so its size acts as a global concurrency limit for that kind of work
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = executor
+        return executor
+
+def map_bounded(func, items, executor, timeout=None, default=None):
+    """
+    Run func over items on executor and return results in item order.
+    Items that raise or are still unfinished after timeout seconds get default(item)
+    instead, so one slow item never holds up the rest. Calls already running keep
+    going in the background; their results are simply not waited for.
+    """
+    futures = [executor.submit(func, item) for item in items]
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done:
+        # Drop work that never started; running calls cannot be interrupted
+        future.cancel()
+
+    results = []
+    for item, future in zip(items, futures):
+        if future in done and future.exception() is None:
+            results.append(future.result())
+        else:
+            if future in done:
+                print(f"Error in {getattr(func, '__name__', 'task')}: {str(future.exception())}")
+            results.append(default(item) if default else None)
+    return results
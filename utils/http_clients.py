@@ -0,0 +1,51 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with a keep-alive connection pool, retries on connection errors
+    and 5xx responses for idempotent requests, and a timeout applied to every request
+    """
+
+    def __init__(self, pool_size=None, timeout=None, retries=2):
+        super().__init__()
+        pool_size = pool_size or _env_int('HTTP_POOL_SIZE', 20)
+        self.timeout = timeout or _env_float('HTTP_TIMEOUT', 10)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        # Override per-call timeouts so every upstream call gets the configured one
+        kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+def openai_http_client(pool_size=None, timeout=None):
+    """
+    httpx client for the OpenAI SDK with an explicit keep-alive pool and timeouts
+    """
+    import httpx
+    from openai import DefaultHttpxClient
+
+    pool_size = pool_size or _env_int('OPENAI_POOL_SIZE', 20)
+    timeout = timeout or _env_float('AI_CALL_TIMEOUT', 20)
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=60
+        ),
+        timeout=httpx.Timeout(timeout, connect=5.0)
+    )
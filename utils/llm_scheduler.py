@@ -0,0 +1,210 @@
+import os
+import time
+import queue
+import random
+import itertools
+import threading
+from concurrent.futures import Future
+from utils import metrics
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0  # articles of the company a user is looking at
+PRIORITY_BACKGROUND = 1   # other user-triggered work, e.g. filters and offline labelling
+PRIORITY_PREFETCH = 2     # warming the cache for newly ingested articles
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_BACKGROUND: 'background', PRIORITY_PREFETCH: 'prefetch'}
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {'APIConnectionError', 'APITimeoutError'}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at per_minute / 60 per second.
+    take() may overdraw the balance; the debt is returned as the time to wait, so callers
+    are paced in the order they reserved.
+    """
+
+    def __init__(self, per_minute, burst_seconds=10):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, amount):
+        """
+        Reserve amount tokens; return seconds until they are actually available
+        """
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def give(self, amount):
+        """
+        Return unused tokens, or take more with a negative amount, after a reservation was settled
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+class _Job:
+    __slots__ = ('func', 'tokens', 'priority', 'future', 'queued')
+
+    def __init__(self, func, tokens, priority):
+        self.func = func
+        self.tokens = tokens
+        self.priority = priority
+        self.future = Future()
+        self.queued = time.monotonic()
+
+class LLMScheduler:
+    """
+    Shared queue for every OpenAI request in the process. Jobs run in priority order on a
+    fixed set of workers, paced by request and token buckets sized to the account's
+    per-minute limits. Rate-limited and transient failures are retried with jittered
+    exponential backoff, and a Retry-After from the API pauses every worker, not just
+    the one that hit it.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_workers=None, max_retries=None,
+                 base_delay=0.5, max_delay=30.0):
+        self.requests = TokenBucket(requests_per_minute or float(os.environ.get('OPENAI_RPM', 500)))
+        self.tokens = TokenBucket(tokens_per_minute or float(os.environ.get('OPENAI_TPM', 40000)))
+        self.max_workers = max_workers or int(os.environ.get('AI_MAX_CONCURRENCY', 5))
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get('OPENAI_MAX_RETRIES', 4))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.resume_at = 0.0
+        self.lock = threading.Lock()
+        self.workers = []
+
+    def submit(self, func, priority=PRIORITY_INTERACTIVE, tokens=0):
+        """
+        Queue func() (one API call) and return a Future for its result.
+        tokens is the estimated prompt plus completion tokens; if the result has a usage
+        with total_tokens the token bucket is corrected once the call returns.
+        """
+        self._start()
+        job = _Job(func, tokens, priority)
+        self.queue.put((priority, next(self.sequence), job))
+        return job.future
+
+    def _start(self):
+        if len(self.workers) >= self.max_workers:
+            return
+        with self.lock:
+            while len(self.workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._work, name=f'llm-scheduler-{len(self.workers)}', daemon=True
+                )
+                worker.start()
+                self.workers.append(worker)
+
+    def _work(self):
+        while True:
+            _, _, job = self.queue.get()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                job.future.set_result(self._run(job))
+            except BaseException as e:
+                job.future.set_exception(e)
+
+    def _run(self, job):
+        priority = PRIORITY_NAMES.get(job.priority, str(job.priority))
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_capacity(job.tokens)
+            if attempt == 0:
+                metrics.observe('llm_queue_seconds', time.monotonic() - job.queued, priority=priority)
+            try:
+                result = job.func()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == self.max_retries:
+                    raise
+                reason = 'rate_limited' if getattr(e, 'status_code', None) == 429 else 'transient'
+                metrics.inc('llm_retries_total', reason=reason)
+                if reason == 'rate_limited':
+                    # The quota is shared, so every worker backs off
+                    self._pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            usage = getattr(result, 'usage', None)
+            if usage is not None and getattr(usage, 'total_tokens', None) is not None:
+                self.tokens.give(job.tokens - usage.total_tokens)
+            return result
+
+    def _wait_for_capacity(self, tokens):
+        delay = max(self.requests.take(1), self.tokens.take(tokens))
+        with self.lock:
+            delay = max(delay, self.resume_at - time.monotonic())
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pause(self, delay):
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + delay)
+
+    def _retry_delay(self, error, attempt):
+        """
+        Seconds to wait before retrying error, or None if it should not be retried
+        """
+        status = getattr(error, 'status_code', None)
+        if status is None and type(error).__name__ not in RETRYABLE_ERRORS:
+            return None
+        if status is not None and status not in RETRYABLE_STATUS:
+            return None
+        if getattr(error, 'code', None) == 'insufficient_quota':
+            # Out of credit, not rate limited; retrying won't help
+            return None
+
+        retry_after = self._retry_after(getattr(error, 'response', None))
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # Full jitter: spread retries so workers don't return in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response):
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            value = headers.get('retry-after')
+            if not value:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                # An HTTP date; rare enough not to import the email package at startup
+                from email.utils import parsedate_to_datetime
+
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """
+    Return the process-wide scheduler, so all analyzers share one set of rate limits
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
@@ -0,0 +1,126 @@
+import os
+import time
+import bisect
+import threading
+from functools import wraps
+from contextlib import contextmanager, nullcontext
+
+# Set METRICS_ENABLED=0 to turn every call in this module into a no-op
+ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HELP = {
+    'upstream_request_seconds': 'Latency of calls to NewsAPI, Yahoo Finance and OpenAI',
+    'cache_lookup_seconds': 'Latency of cache and local store lookups',
+    'cache_requests_total': 'Cache lookups by result',
+    'errors_total': 'Operations that raised',
+    'fallbacks_total': 'Default values returned instead of a real result',
+    'llm_tokens_total': 'OpenAI tokens used, from response usage',
+    'classifications_total': 'News categorizations by local classifier or LLM',
+    'llm_retries_total': 'OpenAI requests retried after rate limiting or a transient error',
+    'llm_queue_seconds': 'Time OpenAI requests waited in the scheduler queue, by priority',
+    'extract_seconds': 'Time spent extracting article text from downloaded pages',
+    'llm_escalations_total': 'Small-model answers re-asked of the escalation model, by task and reason',
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_noop = nullcontext()
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def inc(name, value=1, **labels):
+    """
+    Add value to a counter
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+    """
+    Record one observation in a histogram
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+        histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+@contextmanager
+def _timer(name, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc('errors_total', **labels)
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def timed(name, **labels):
+    """
+    Context manager recording the duration of its block in a histogram,
+    and counting errors_total if the block raises
+    """
+    return _timer(name, labels) if ENABLED else _noop
+
+def instrument(name, **labels):
+    """
+    Decorator version of timed()
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def render():
+    """
+    Render all metrics in the Prometheus text exposition format
+    """
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(buckets), total, count) for key, (buckets, total, count) in _histograms.items()}
+
+    lines = []
+    for metric_type, series in (('counter', counters), ('histogram', histograms)):
+        for name in sorted({name for name, _ in series}):
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (series_name, labels), value in sorted(series.items()):
+                if series_name != name:
+                    continue
+                if metric_type == 'counter':
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+                    continue
+                buckets, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(DEFAULT_BUCKETS + ('+Inf',), buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return '\n'.join(lines) + '\n'
@@ -1,44 +1,125 @@
 import os
-from newsapi import NewsApiClient
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+from utils.news_store import NewsStore
+from utils.article_extractor import ArticleExtractor
+from utils import metrics
 
 class NewsFetcher:
-    def __init__(self):
-        self.newsapi = NewsApiClient(api_key=os.environ.get('NEWS_API_KEY'))
+    def __init__(self, store=None, refresh_interval=None, client=None, extractor=None):
+        # client: anything with NewsApiClient's get_everything(), e.g. a benchmark fake.
+        # The NewsAPI client is only built on first use.
+        self._newsapi = client
+        self.store = store if store is not None else NewsStore()
+        # Seconds before a company's articles are considered stale and re-polled
+        self.refresh_interval = refresh_interval or int(os.environ.get('NEWS_REFRESH_INTERVAL', 900))
+        # Seconds before retrying a failed poll, doubled per consecutive failure up to refresh_interval
+        self.retry_backoff = int(os.environ.get('NEWS_RETRY_BACKOFF', 30))
+        # Adds each article's full text as 'content'; NewsAPI only returns a truncated description.
+        # The ingestor extracts new articles ahead of time; fetch_news only reads stored texts.
+        self.extractor = extractor if extractor is not None else ArticleExtractor(self.store)
+
+    @property
+    def newsapi(self):
+        if self._newsapi is None:
+            from newsapi import NewsApiClient
+            from utils.http_clients import PooledSession
+
+            self._newsapi = NewsApiClient(api_key=os.environ.get('NEWS_API_KEY'), session=PooledSession())
+        return self._newsapi
+
+    def is_due(self, company_name):
+        """
+        Whether a company should be polled: never polled, its articles are older than
+        refresh_interval, or its last failed poll is past the retry backoff
+        """
+        _, last_polled, failures = self.store.get_state(company_name)
+        if last_polled is None:
+            return True
+        interval = self.refresh_interval
+        if failures:
+            interval = min(interval, self.retry_backoff * 2 ** (failures - 1))
+        return time.time() - last_polled > interval
 
     def fetch_news(self, company_name):
         """
-        Fetch news articles for a specific company
+        Fetch news articles for a specific company from the local store, with their full text
+        where it has already been extracted, ingesting new articles first if the company has
+        not been polled recently.
+        If NewsAPI fails, the stored articles are served; only an empty store is an error,
+        also while a failed first poll waits out its retry backoff.
         """
         try:
-            # Get news from the last 7 days
-            from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-            to_date = datetime.now().strftime('%Y-%m-%d')
-
-            articles = self.newsapi.get_everything(
-                q=company_name,
-                from_param=from_date,
-                to=to_date,
-                language='en',
-                sort_by='relevancy',
-                page_size=5  # Limit to 5 articles
-            )
-
-            # Format articles
-            formatted_articles = []
-            for article in articles['articles']:
-                formatted_articles.append({
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('name', 'Unknown'),
-                    'publishedAt': datetime.strptime(
-                        article.get('publishedAt', ''), 
-                        '%Y-%m-%dT%H:%M:%SZ'
-                    ).strftime('%Y-%m-%d %H:%M')
-                })
-
-            return formatted_articles[:5]  # Ensure we never return more than 5
+            self.store.mark_requested(company_name)
+            error = None
+            _, _, failures = self.store.get_state(company_name)
+            if failures:
+                # Until the backoff has passed, an empty store is the outage, not a lack of news
+                error = Exception("NewsAPI request failed; retrying shortly")
+            if self.is_due(company_name):
+                metrics.inc('cache_requests_total', cache='news_store', result='miss')
+                try:
+                    self.ingest(company_name)
+                    error = None
+                except Exception as e:
+                    print(f"Error in fetch_news for {company_name}: {str(e)}")
+                    error = e
+            else:
+                metrics.inc('cache_requests_total', cache='news_store', result='hit')
+
+            articles = self.store.latest(company_name, limit=5)
+            if error is not None and not articles:
+                raise error
+            # Extraction can take seconds, so it never runs on the request path
+            return self.extractor.with_stored_text(articles)
 
         except Exception as e:
-            raise Exception(f"Failed to fetch news: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to fetch news: {str(e)}")
+
+    def ingest(self, company_name):
+        """
+        Query NewsAPI only for articles newer than the last one seen for this company
+        and add them to the store. Returns the number of new articles.
+        A failed request is recorded for the retry backoff and re-raised.
+        """
+        last_published, _, _ = self.store.get_state(company_name)
+        if last_published is None:
+            # First poll: get news from the last 7 days
+            from_param = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        else:
+            from_param = datetime.fromtimestamp(last_published + 1, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+        try:
+            with metrics.timed('upstream_request_seconds', operation='newsapi'):
+                response = self.newsapi.get_everything(
+                    q=company_name,
+                    from_param=from_param,
+                    language='en',
+                    sort_by='publishedAt',
+                    page_size=20
+                )
+        except Exception:
+            self.store.mark_failed(company_name)
+            raise
+
+        articles = []
+        for article in response['articles']:
+            try:
+                published_at = int(datetime.strptime(
+                    article.get('publishedAt', ''),
+                    '%Y-%m-%dT%H:%M:%SZ'
+                ).replace(tzinfo=timezone.utc).timestamp())
+            except (TypeError, ValueError):
+                continue
+            articles.append({
+                'title': article.get('title') or '',
+                'description': article.get('description') or '',
+                'url': article.get('url') or '',
+                'source': (article.get('source') or {}).get('name') or 'Unknown',
+                'published_at': published_at
+            })
+
+        added = self.store.add_articles(company_name, articles)
+        newest = max((article['published_at'] for article in articles), default=None)
+        self.store.mark_polled(company_name, newest)
+        return added
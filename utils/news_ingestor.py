@@ -0,0 +1,110 @@
+import os
+import time
+import threading
+from utils.llm_scheduler import PRIORITY_PREFETCH
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every process polls
+    fcntl = None
+
+class NewsIngestor:
+    """
+    Background poller that keeps the companies viewed in the last watch_window seconds
+    up to date, so NewsFetcher.fetch_news reads are local lookups. Companies nobody has
+    asked for within the window are dropped from the store's poll list; viewing them
+    again starts a fresh poll. When several processes share a store (e.g. server
+    workers), only the one holding the store's lock file polls.
+    Companies with new articles get their full text extracted. Given an analyzer, those viewed
+    within the last prefetch_window seconds are also analyzed at prefetch priority, at most
+    prefetch_max per cycle, with the sentiment scores added to sentiment_index.
+    """
+
+    def __init__(self, news_fetcher, poll_interval=None, max_age_days=30, analyzer=None, sentiment_index=None):
+        self.news_fetcher = news_fetcher
+        self.analyzer = analyzer
+        self.sentiment_index = sentiment_index
+        self.poll_interval = poll_interval or int(os.environ.get('NEWS_POLL_INTERVAL', 60))
+        self.max_age_days = max_age_days
+        self.watch_window = int(os.environ.get('NEWS_WATCH_WINDOW', 6 * 3600))
+        # Analysis prefetch spends LLM budget, so it is limited to companies in active use
+        self.prefetch_enabled = os.environ.get('NEWS_PREFETCH_ENABLED', '1') != '0'
+        self.prefetch_window = int(os.environ.get('NEWS_PREFETCH_WINDOW', 3600))
+        self.prefetch_max = int(os.environ.get('NEWS_PREFETCH_MAX', 5))
+        self.thread = None
+        self.lock_file = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._run, name='news-ingestor', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def poll_once(self):
+        """
+        Ingest every recently viewed company the fetcher considers due for a poll
+        """
+        store = self.news_fetcher.store
+        now = time.time()
+        requested_since = now - self.watch_window
+        prefetch = set(store.companies(now - self.prefetch_window)) if self.prefetch_enabled else set()
+        prefetched = 0
+        for company in store.companies(requested_since):
+            if not self.news_fetcher.is_due(company):
+                continue
+            try:
+                added = self.news_fetcher.ingest(company)
+            except Exception as e:
+                print(f"Error ingesting news for {company}: {str(e)}")
+                continue
+            if added:
+                analyze = company in prefetch and prefetched < self.prefetch_max
+                prefetched += analyze
+                self._prefetch(company, analyze)
+        store.prune(self.max_age_days, requested_since)
+
+    def _prefetch(self, company, analyze=True):
+        """
+        Extract the full text of the articles a viewer would see next and, if analyze is set,
+        warm the analysis cache for them; analysis is queued behind interactive requests
+        """
+        try:
+            articles = self.news_fetcher.extractor.with_full_text(self.news_fetcher.store.latest(company, limit=5))
+            if not analyze or self.analyzer is None or not self.analyzer.enabled:
+                return
+            analyses = self.analyzer.analyze_batch(articles, PRIORITY_PREFETCH)
+            if self.sentiment_index is not None:
+                self.sentiment_index.record(
+                    company, articles, [self.analyzer.scored_sentiment(analysis) for analysis in analyses]
+                )
+        except Exception as e:
+            print(f"Error prefetching {company}: {str(e)}")
+
+    def _acquire_leadership(self):
+        """
+        Try to become the polling process for this store; others keep retrying in case it exits
+        """
+        if self.lock_file is not None or fcntl is None:
+            return True
+        lock_file = open(f"{self.news_fetcher.store.path}.ingest.lock", 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self.lock_file = lock_file
+        return True
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                if self._acquire_leadership():
+                    self.poll_once()
+            except Exception as e:
+                print(f"Error in news ingestor: {str(e)}")
+            self.stopped.wait(self.poll_interval)
@@ -0,0 +1,244 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timezone
+from utils import metrics
+
+DEFAULT_STORE_PATH = os.path.join('.cache', 'news.sqlite3')
+
+class NewsStore:
+    """
+    Local SQLite store of ingested news articles, de-duplicated by URL and by content hash
+    and linked to every company they were found for.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('NEWS_STORE_PATH', DEFAULT_STORE_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                content_hash TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT NOT NULL,
+                published_at INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS article_companies (
+                company TEXT NOT NULL,
+                article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+                published_at INTEGER NOT NULL,
+                PRIMARY KEY (company, article_id)
+            );
+            CREATE INDEX IF NOT EXISTS article_companies_latest
+                ON article_companies (company, published_at DESC);
+            CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at);
+            CREATE TABLE IF NOT EXISTS companies (
+                company TEXT PRIMARY KEY,
+                last_published INTEGER,
+                last_polled REAL,
+                last_requested REAL,
+                failures INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS article_texts (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                extracted_at REAL NOT NULL
+            );
+        """)
+        self._add_columns('companies', {'last_requested': 'REAL', 'failures': 'INTEGER NOT NULL DEFAULT 0'})
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.commit()
+
+    def _add_columns(self, table, columns):
+        """
+        Add columns missing from a table created by an older version
+        """
+        existing = {row[1] for row in self.db.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns.items():
+            if name not in existing:
+                self.db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    @staticmethod
+    def normalize_company(company_name):
+        return ' '.join(company_name.lower().split())
+
+    @staticmethod
+    def content_hash(title, description):
+        """
+        Hash of the normalized title and description, so syndicated copies of one story match
+        """
+        text = ' '.join(f"{title} {description}".lower().split())
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def add_articles(self, company_name, articles):
+        """
+        Store articles for a company, skipping ones already known by URL or content hash.
+        Each article needs title, description, url, source and published_at (epoch seconds).
+        Returns the number of articles that were new to the store.
+        """
+        company = self.normalize_company(company_name)
+        added = 0
+        with self.lock:
+            for article in articles:
+                url = article['url'] or None
+                digest = self.content_hash(article['title'], article['description'])
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO articles "
+                    "(url, content_hash, title, description, source, published_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, digest, article['title'], article['description'],
+                     article['source'], article['published_at'])
+                )
+                if cursor.rowcount:
+                    article_id = cursor.lastrowid
+                    added += 1
+                else:
+                    article_id = self.db.execute(
+                        "SELECT id FROM articles WHERE url = ? OR content_hash = ?", (url, digest)
+                    ).fetchone()[0]
+                self.db.execute(
+                    "INSERT OR IGNORE INTO article_companies (company, article_id, published_at) "
+                    "VALUES (?, ?, ?)",
+                    (company, article_id, article['published_at'])
+                )
+            self.db.commit()
+        return added
+
+    @metrics.instrument('cache_lookup_seconds', cache='news_store')
+    def latest(self, company_name, limit=5):
+        """
+        Return the most recent articles for a company in the NewsFetcher article format
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT a.title, a.description, a.url, a.source, a.published_at "
+                "FROM article_companies c JOIN articles a ON a.id = c.article_id "
+                "WHERE c.company = ? ORDER BY c.published_at DESC LIMIT ?",
+                (self.normalize_company(company_name), limit)
+            ).fetchall()
+        return [
+            {
+                'title': title,
+                'description': description,
+                'url': url or '',
+                'source': source,
+                'publishedAt': datetime.fromtimestamp(published_at, timezone.utc).strftime('%Y-%m-%d %H:%M')
+            }
+            for title, description, url, source, published_at in rows
+        ]
+
+    def get_state(self, company_name):
+        """
+        Return (last_published, last_polled, failures) for a company, or (None, None, 0) if never
+        polled; failures counts the polls that have failed in a row since the last successful one
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT last_published, last_polled, failures FROM companies WHERE company = ?",
+                (self.normalize_company(company_name),)
+            ).fetchone()
+        return row if row else (None, None, 0)
+
+    def mark_polled(self, company_name, last_published):
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO companies (company, last_published, last_polled) VALUES (?, ?, ?) "
+                "ON CONFLICT (company) DO UPDATE SET "
+                "last_published = COALESCE(MAX(excluded.last_published, companies.last_published), "
+                "excluded.last_published, companies.last_published), "
+                "last_polled = excluded.last_polled, failures = 0",
+                (self.normalize_company(company_name), last_published, time.time())
+            )
+            self.db.commit()
+
+    def mark_failed(self, company_name):
+        """
+        Record a failed poll, so the company is retried after a backoff rather than on every request
+        """
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO companies (company, last_polled, failures) VALUES (?, ?, 1) "
+                "ON CONFLICT (company) DO UPDATE SET "
+                "last_polled = excluded.last_polled, failures = companies.failures + 1",
+                (self.normalize_company(company_name), time.time())
+            )
+            self.db.commit()
+
+    def mark_requested(self, company_name):
+        """
+        Record that someone asked for a company's news, keeping it on the ingestor's watch list
+        """
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO companies (company, last_requested) VALUES (?, ?) "
+                "ON CONFLICT (company) DO UPDATE SET last_requested = excluded.last_requested",
+                (self.normalize_company(company_name), time.time())
+            )
+            self.db.commit()
+
+    def companies(self, requested_since=0):
+        """
+        Return every company whose news was requested at or after requested_since (epoch seconds),
+        most recently requested first
+        """
+        with self.lock:
+            return [
+                row[0] for row in self.db.execute(
+                    "SELECT company FROM companies WHERE last_requested >= ? ORDER BY last_requested DESC",
+                    (requested_since,)
+                )
+            ]
+
+    def get_texts(self, urls):
+        """
+        Return {url: extracted full text} for the urls that have been extracted
+        """
+        if not urls:
+            return {}
+        with self.lock:
+            # Empty texts were stored for failed pages by earlier versions; they are retried
+            rows = self.db.execute(
+                f"SELECT url, text FROM article_texts WHERE text != '' AND url IN ({', '.join('?' * len(urls))})",
+                list(urls)
+            ).fetchall()
+        return dict(rows)
+
+    def save_texts(self, texts):
+        """
+        Store extracted full texts by url
+        """
+        now = time.time()
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO article_texts (url, text, extracted_at) VALUES (?, ?, ?)",
+                [(url, text, now) for url, text in texts.items()]
+            )
+            self.db.commit()
+
+    def prune(self, max_age_days=30, requested_since=None):
+        """
+        Delete articles older than max_age_days, full texts no longer linked to an article and,
+        given requested_since, the poll state of companies nobody has asked for since then
+        """
+        cutoff = int(time.time()) - max_age_days * 86400
+        with self.lock:
+            if requested_since is not None:
+                self.db.execute(
+                    "DELETE FROM companies WHERE last_requested IS NULL OR last_requested < ?",
+                    (requested_since,)
+                )
+            self.db.execute("DELETE FROM article_companies WHERE published_at < ?", (cutoff,))
+            self.db.execute("DELETE FROM articles WHERE published_at < ?", (cutoff,))
+            self.db.execute(
+                "DELETE FROM article_texts WHERE url NOT IN (SELECT url FROM articles WHERE url IS NOT NULL)"
+            )
+            self.db.commit()
@@ -0,0 +1,102 @@
+import numpy as np
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: return the indices of at most threshold
+    points that preserve the visual shape of the series y over x
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # Interior points 1..n-2 split into threshold-2 buckets; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        indices[bucket + 1] = selected
+    return indices
+
+class PriceHistory:
+    """
+    Price history stored as parallel typed arrays: int64 epoch-second timestamps
+    and float32 open/high/low/close/volume
+    """
+
+    __slots__ = ('t', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, t, open, high, low, close, volume):
+        self.t = np.asarray(t, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+        self.low = np.asarray(low, dtype=np.float32)
+        self.close = np.asarray(close, dtype=np.float32)
+        self.volume = np.asarray(volume, dtype=np.float32)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Build from a yfinance OHLCV DataFrame indexed by timestamp
+        """
+        frame = frame.dropna(subset=['Close'])
+        t = frame.index.values.astype('datetime64[s]').astype(np.int64)
+        column = lambda name: frame[name].to_numpy() if name in frame else np.zeros(len(frame))
+        return cls(t, column('Open'), column('High'), column('Low'), frame['Close'].to_numpy(),
+                   np.nan_to_num(column('Volume')))
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], [], [])
+
+    def __len__(self):
+        return len(self.t)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, field).nbytes for field in self.__slots__)
+
+    def downsample(self, max_points):
+        """
+        Return a copy with at most max_points points, chosen by LTTB on the close price
+        """
+        if len(self) <= max_points:
+            return self
+        indices = lttb_indices(self.t, self.close, max_points)
+        return PriceHistory(*(getattr(self, field)[indices] for field in self.__slots__))
+
+    def to_dict(self, fields=('o', 'h', 'l', 'c', 'v')):
+        """
+        Columnar JSON-ready form, e.g. {'t': [...], 'c': [...]}, with the timestamps and the
+        requested columns out of o/h/l/c/v
+        """
+        columns = {'o': self.open, 'h': self.high, 'l': self.low, 'c': self.close}
+        result = {'t': self.t.tolist()}
+        for field in fields:
+            if field == 'v':
+                result['v'] = self.volume.astype(np.int64).tolist()
+            elif field in columns:
+                result[field] = np.round(columns[field].astype(np.float64), 4).tolist()
+        return result
+
+    def close_series(self):
+        """
+        Close prices as a pandas Series indexed by datetime, for charting
+        """
+        import pandas as pd
+
+        return pd.Series(self.close, index=pd.to_datetime(self.t, unit='s'), name='Close')
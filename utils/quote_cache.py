@@ -0,0 +1,97 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from utils.concurrency import get_executor
+from utils import metrics
+
+class QuoteCache:
+    """
+    Thread-safe, size-bounded LRU cache with stale-while-revalidate and single-flight loading.
+    Fresh entries are served directly. Entries up to stale_grace seconds past their TTL are
+    served stale while one background refresh runs. Concurrent misses for the same key share
+    a single load.
+    """
+
+    def __init__(self, ttl=300, stale_grace=120, max_size=512, refresh_workers=4):
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self.max_size = max_size
+        self.refresh_workers = refresh_workers
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get(self, key):
+        """
+        Return the cached value if it is still fresh, otherwise None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.entries.move_to_end(key)
+                return entry[1]
+            return None
+
+    def set(self, key, value):
+        with self.lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """
+        Return the value for key, calling loader() at most once at a time per key.
+        loader may return None to signal failure; failures are not cached.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[0]
+                if age < self.ttl:
+                    self.entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    metrics.inc('cache_requests_total', cache='quote', result='hit')
+                    return entry[1]
+                if age < self.ttl + self.stale_grace:
+                    self.entries.move_to_end(key)
+                    self.stats['stale_hits'] += 1
+                    metrics.inc('cache_requests_total', cache='quote', result='stale_hit')
+                    if key not in self.inflight:
+                        future = self.inflight[key] = Future()
+                        executor = get_executor('quote-refresh', self.refresh_workers)
+                        executor.submit(self._load, key, loader, future)
+                    return entry[1]
+
+            future = self.inflight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                metrics.inc('cache_requests_total', cache='quote', result='coalesced')
+                leader = False
+            else:
+                self.stats['misses'] += 1
+                metrics.inc('cache_requests_total', cache='quote', result='miss')
+                future = self.inflight[key] = Future()
+                leader = True
+
+        if leader:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"Error loading {key}: {str(e)}")
+            value = None
+
+        with self.lock:
+            if value is not None:
+                self._store(key, value)
+            self.inflight.pop(key, None)
+        future.set_result(value)
+
+    def _store(self, key, value):
+        self.entries[key] = (time.monotonic(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
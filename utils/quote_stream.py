@@ -0,0 +1,173 @@
+import os
+import time
+import queue
+import threading
+
+# Quote fields pushed to clients; only the ones that changed are sent after the first update
+QUOTE_FIELDS = ('price', 'change', 'change_percent', 'volume')
+
+class Subscription:
+    """
+    One client's interest in a set of companies. Updates arrive on self.queue as
+    {company name: {field: value}} dicts, using the names the client subscribed with.
+    """
+
+    def __init__(self, names, max_pending=100):
+        self.names = names  # ticker -> [company names as given by the client]
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.resync = False
+
+    def put(self, update):
+        try:
+            self.queue.put_nowait(update)
+        except queue.Full:
+            # Slow consumer; it gets a full snapshot instead of the deltas it missed
+            self.resync = True
+
+    def clear(self):
+        """
+        Drop queued updates that a new snapshot supersedes
+        """
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+class QuoteStream:
+    """
+    Single background poller for live quotes. Each cycle fetches the union of symbols
+    that any subscriber (or a recent latest() caller) is interested in, with one bulk
+    request, and pushes only the fields that changed to the subscribers of each symbol.
+    Upstream load therefore grows with unique symbols, not with connected clients.
+    """
+
+    def __init__(self, stock_fetcher, interval=None, watch_ttl=120):
+        self.stock_fetcher = stock_fetcher
+        self.interval = interval or float(os.environ.get('QUOTE_POLL_INTERVAL', 15))
+        # Symbols read through latest() stay polled this long after the last read
+        self.watch_ttl = watch_ttl
+        # Stream connections are closed after this long and reopened by the client, so a
+        # client that went away without closing cannot hold a server thread indefinitely
+        self.max_connection = float(os.environ.get('QUOTE_STREAM_MAX_SECONDS', 300))
+        self.quotes = {}
+        self.subscriptions = set()
+        self.watched = {}
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def subscribe(self, companies):
+        """
+        Register a subscriber; follow with snapshot() for the quotes already known
+        """
+        names = {}
+        for company in companies:
+            ticker = self.stock_fetcher.ticker_index.resolve(company)
+            if ticker:
+                names.setdefault(ticker, []).append(company)
+        subscription = Subscription(names)
+
+        with self.lock:
+            self.subscriptions.add(subscription)
+            unknown = any(ticker not in self.quotes for ticker in names)
+        self._start()
+        if unknown:
+            # Don't make a new subscriber wait a full interval for its first prices
+            self.wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def snapshot(self, subscription):
+        """
+        Every known quote for a subscriber. Updates already queued for it are discarded, since
+        the snapshot is newer; updates are only queued under the same lock.
+        """
+        with self.lock:
+            subscription.resync = False
+            subscription.clear()
+            return self._snapshot(subscription)
+
+    def latest(self, companies):
+        """
+        Return the last polled quote for each company (None if not polled yet) and
+        keep those symbols polled for watch_ttl seconds, for clients that read rather than subscribe
+        """
+        tickers = {company: self.stock_fetcher.ticker_index.resolve(company) for company in companies}
+        now = time.monotonic()
+        with self.lock:
+            for ticker in tickers.values():
+                if ticker:
+                    self.watched[ticker] = now
+            result = {company: self.quotes.get(ticker) for company, ticker in tickers.items()}
+        self._start()
+        if any(quote is None for quote in result.values()):
+            self.wake.set()
+        return result
+
+    def _snapshot(self, subscription):
+        return {
+            name: dict(self.quotes[ticker])
+            for ticker, names in subscription.names.items() if ticker in self.quotes
+            for name in names
+        }
+
+    def _start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='quote-stream', daemon=True)
+                self.thread.start()
+
+    def _symbols(self):
+        cutoff = time.monotonic() - self.watch_ttl
+        with self.lock:
+            self.watched = {ticker: seen for ticker, seen in self.watched.items() if seen > cutoff}
+            symbols = set(self.watched)
+            for subscription in self.subscriptions:
+                symbols.update(subscription.names)
+        return sorted(symbols)
+
+    def poll_once(self):
+        """
+        Fetch quotes for every symbol of interest and push changes; returns the number of symbols polled
+        """
+        symbols = self._symbols()
+        if not symbols:
+            return 0
+
+        fetched = self.stock_fetcher.get_live_quotes(symbols)
+        changes = {}
+        with self.lock:
+            for ticker, quote in fetched.items():
+                if quote is None:
+                    continue
+                quote = {field: quote[field] for field in QUOTE_FIELDS}
+                previous = self.quotes.get(ticker, {})
+                delta = {field: value for field, value in quote.items() if previous.get(field) != value}
+                if delta:
+                    changes[ticker] = delta
+                    self.quotes[ticker] = quote
+
+            for subscription in list(self.subscriptions):
+                if subscription.resync:
+                    continue
+                update = {
+                    name: changes[ticker]
+                    for ticker, names in subscription.names.items() if ticker in changes
+                    for name in names
+                }
+                if update:
+                    subscription.put(update)
+        return len(symbols)
+
+    def _run(self):
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Error polling quotes: {str(e)}")
+            self.wake.wait(self.interval)
+            self.wake.clear()
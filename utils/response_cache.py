@@ -0,0 +1,158 @@
+import gzip
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from utils import metrics
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+class CachedResponse:
+    """
+    One serialized response body with its precompressed variants and a strong ETag
+    """
+
+    __slots__ = ('body', 'encoded', 'digest', 'mimetype', 'created', 'ttl')
+
+    def __init__(self, body, mimetype, ttl):
+        self.body = body
+        self.mimetype = mimetype
+        self.ttl = ttl
+        self.created = time.monotonic()
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.encoded = {}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.encoded['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+
+    def age(self):
+        return time.monotonic() - self.created
+
+    def remaining(self):
+        return max(0, int(self.ttl - self.age()))
+
+    def etag(self, encoding=None):
+        # Strong ETags must differ between content codings of the same body
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def matches(self, if_none_match):
+        """
+        True if an If-None-Match header value names any representation of this body
+        """
+        return etag_matches(if_none_match, self.digest)
+
+    def negotiate(self, accept_encoding):
+        """
+        Return (encoding, body) for the best precompressed variant the client accepts
+        """
+        return negotiate(self.encoded, self.body, accept_encoding)
+
+def etag_matches(if_none_match, digest):
+    """
+    True if an If-None-Match header lists digest under any content coding suffix
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"').split('-')[0] == digest:
+            return True
+    return False
+
+def negotiate(encoded, body, accept_encoding):
+    """
+    Pick the encoded {'gzip': bytes} variant if an Accept-Encoding header allows it.
+    Returns (encoding, body), with encoding None for identity.
+    """
+    accepted = {}
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    if 'gzip' in encoded and accepted.get('gzip', 0) > 0:
+        return 'gzip', encoded['gzip']
+    return None, body
+
+class _Build:
+    """
+    One in-progress build of a key; callers that waited on it take its entry rather than
+    building again, even if that entry is not stored
+    """
+
+    __slots__ = ('lock', 'entry', 'done')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entry = None
+        self.done = False
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized API responses, each with its own TTL.
+    Concurrent misses for the same key share one build.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.building = {}
+        self.lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """
+        Return the cached response for key, or call build() -> (body bytes, mimetype, ttl) or None.
+        Responses built with a ttl of 0 or less, or a None result, are not stored, but are still
+        returned to every request that was waiting on that build.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.age() < entry.ttl:
+                self.entries.move_to_end(key)
+                metrics.inc('cache_requests_total', cache='response', result='hit')
+                return entry
+            pending = self.building.get(key)
+            if pending is None:
+                pending = self.building[key] = _Build()
+
+        with pending.lock:
+            if pending.done:
+                metrics.inc('cache_requests_total', cache='response', result='coalesced')
+                return pending.entry
+            metrics.inc('cache_requests_total', cache='response', result='miss')
+            try:
+                pending.entry = self._build(key, build)
+                pending.done = True
+                return pending.entry
+            finally:
+                # A failed build is left not done, so the next waiter tries again
+                with self.lock:
+                    if self.building.get(key) is pending:
+                        del self.building[key]
+
+    def _build(self, key, build):
+        result = build()
+        if result is None:
+            return None
+
+        body, mimetype, ttl = result
+        entry = CachedResponse(body, mimetype, ttl)
+        if ttl > 0:
+            with self.lock:
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from utils.news_store import NewsStore
+from utils import metrics
+
+DEFAULT_INDEX_PATH = os.path.join('.cache', 'sentiment.sqlite3')
+DAY = 86400
+
+class SentimentIndex:
+    """
+    Persisted per-company news sentiment. Each scored article is stored once, with its
+    publication time, and per-day sums are updated as articles are added, so aggregates
+    over any range read one row per day however many articles have accumulated.
+    Scores are the 1-5 star rating mapped to -1..1 and weighted by the model's confidence.
+    Companies are keyed by ticker when ticker_index resolves them, so "Apple" and "AAPL"
+    share one history; others by their normalized name.
+    """
+
+    def __init__(self, path=None, ticker_index=None):
+        self.path = path or os.environ.get('SENTIMENT_INDEX_PATH', DEFAULT_INDEX_PATH)
+        self.ticker_index = ticker_index
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS article_scores (
+                company TEXT NOT NULL,
+                article TEXT NOT NULL,
+                published_at INTEGER NOT NULL,
+                score REAL NOT NULL,
+                confidence REAL NOT NULL,
+                PRIMARY KEY (company, article)
+            );
+            CREATE TABLE IF NOT EXISTS daily_scores (
+                company TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                articles INTEGER NOT NULL,
+                score_sum REAL NOT NULL,
+                weighted_sum REAL NOT NULL,
+                weight_sum REAL NOT NULL,
+                PRIMARY KEY (company, day)
+            );
+        """)
+        self.db.commit()
+
+    def company_key(self, company_name):
+        ticker = self.ticker_index.resolve(company_name) if self.ticker_index is not None else None
+        return ticker or NewsStore.normalize_company(company_name)
+
+    @staticmethod
+    def _published_at(article):
+        """
+        Epoch seconds of a NewsStore article's 'publishedAt' ('%Y-%m-%d %H:%M', UTC), or None
+        """
+        try:
+            published = datetime.strptime(article.get('publishedAt') or '', '%Y-%m-%d %H:%M')
+        except ValueError:
+            return None
+        return int(published.replace(tzinfo=timezone.utc).timestamp())
+
+    def record(self, company_name, articles, sentiments):
+        """
+        Add the sentiment of each article (a {'rating', 'confidence'} dict; None or a failed one is skipped).
+        Articles already recorded for the company keep their first score. Returns the number added.
+        """
+        company = self.company_key(company_name)
+        rows = []
+        for article, sentiment in zip(articles, sentiments):
+            published_at = self._published_at(article)
+            key = article.get('url') or article.get('title')
+            if not sentiment or sentiment.get('failed') or published_at is None or not key:
+                continue
+            score = (float(sentiment['rating']) - 3) / 2
+            confidence = max(float(sentiment['confidence']), 0.01)
+            rows.append((key, published_at, score, confidence))
+
+        added = 0
+        with self.lock:
+            for key, published_at, score, confidence in rows:
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO article_scores (company, article, published_at, score, confidence) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (company, key, published_at, score, confidence)
+                )
+                if not cursor.rowcount:
+                    continue
+                self.db.execute("""
+                    INSERT INTO daily_scores (company, day, articles, score_sum, weighted_sum, weight_sum)
+                    VALUES (?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (company, day) DO UPDATE SET
+                        articles = articles + 1,
+                        score_sum = score_sum + excluded.score_sum,
+                        weighted_sum = weighted_sum + excluded.weighted_sum,
+                        weight_sum = weight_sum + excluded.weight_sum
+                """, (company, published_at // DAY, score, score * confidence, confidence))
+                added += 1
+            self.db.commit()
+        return added
+
+    def daily(self, company_name, first_day, last_day):
+        """
+        Per-day sums for days first_day..last_day (days since the epoch) that have articles, as
+        NumPy arrays: (day, articles, score_sum, weighted_sum, weight_sum)
+        """
+        import numpy as np
+
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT day, articles, score_sum, weighted_sum, weight_sum FROM daily_scores "
+                "WHERE company = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (self.company_key(company_name), int(first_day), int(last_day))
+            ).fetchall()
+        table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        return table[:, 0].astype(np.int64), table[:, 1], table[:, 2], table[:, 3], table[:, 4]
+
+    def aligned(self, company_name, timestamps, window=7, volumes=None):
+        """
+        Sentiment as of each timestamp (e.g. PriceHistory.t), as lists with None where no articles count:
+          articles         articles since the previous timestamp's day, so weekend news lands on Monday's bar
+          mean             their mean score
+          weighted         their confidence-weighted score
+          rolling          confidence-weighted score over the window days up to the timestamp;
+                           busy news days weigh more
+          volume_weighted  weighted scores of the bars in the window, averaged by each bar's trading
+                           volume (volumes, e.g. PriceHistory.volume); None if volumes is not given
+          momentum         change in rolling over the last window days
+        """
+        import numpy as np
+
+        with metrics.timed('cache_lookup_seconds', cache='sentiment_index'):
+            bar_days = np.asarray(timestamps, dtype=np.int64) // DAY
+            if not len(bar_days):
+                fields = ('articles', 'mean', 'weighted', 'rolling', 'volume_weighted', 'momentum')
+                return {field: [] for field in fields}
+
+            days, articles, score_sum, weighted_sum, weight_sum = self.daily(
+                company_name, bar_days[0] - 2 * window, bar_days[-1]
+            )
+            cumulative = [np.concatenate(([0.0], np.cumsum(column)))
+                          for column in (articles, score_sum, weighted_sum, weight_sum)]
+
+            def between(after, through):
+                # Sums over days in (after, through], for every bar at once
+                start = np.searchsorted(days, after, side='right')
+                end = np.searchsorted(days, through, side='right')
+                return [column[end] - column[start] for column in cumulative]
+
+            previous = np.concatenate(([bar_days[0] - 1], bar_days[:-1]))
+            count, total, weighted, weights = between(np.minimum(previous, bar_days - 1), bar_days)
+            _, _, rolling_weighted, rolling_weights = between(bar_days - window, bar_days)
+            _, _, earlier_weighted, earlier_weights = between(bar_days - 2 * window, bar_days - window)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                bar_weighted = np.where(weights > 0, weighted / weights, np.nan)
+                rolling = np.where(rolling_weights > 0, rolling_weighted / rolling_weights, np.nan)
+                earlier = np.where(earlier_weights > 0, earlier_weighted / earlier_weights, np.nan)
+                if volumes is None:
+                    volume_weighted = np.full(len(bar_days), np.nan)
+                else:
+                    # Same prefix-sum trick over bars: bars in (day - window, day] that have news
+                    volume = np.where(weights > 0, np.asarray(volumes, dtype=np.float64), 0.0)
+                    scored = np.where(weights > 0, bar_weighted * volume, 0.0)
+                    start = np.searchsorted(bar_days, bar_days - window, side='right')
+                    end = np.arange(1, len(bar_days) + 1)
+                    volume_sums = np.concatenate(([0.0], np.cumsum(volume)))
+                    scored_sums = np.concatenate(([0.0], np.cumsum(scored)))
+                    window_volume = volume_sums[end] - volume_sums[start]
+                    window_scored = scored_sums[end] - scored_sums[start]
+                    volume_weighted = np.where(window_volume > 0, window_scored / window_volume, np.nan)
+                series = {
+                    'articles': count.astype(np.int64).tolist(),
+                    'mean': self._values(np.where(count > 0, total / count, np.nan)),
+                    'weighted': self._values(bar_weighted),
+                    'rolling': self._values(rolling),
+                    'volume_weighted': self._values(volume_weighted),
+                    'momentum': self._values(rolling - earlier),
+                }
+        return series
+
+    @staticmethod
+    def _values(array):
+        import numpy as np
+
+        rounded = np.round(array, 4)
+        return [None if np.isnan(value) else value for value in rounded.tolist()]
@@ -0,0 +1,103 @@
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from utils.response_cache import MIN_COMPRESS_SIZE, etag_matches, negotiate
+
+# Vite's default output names: assets/<name>-<8 char content hash>.<ext>
+HASHED_NAME = re.compile(r'(^|/)assets/.+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+class StaticAsset:
+    """
+    One file from the build directory held in memory, with its compressed variants
+    and precomputed response headers
+    """
+
+    __slots__ = ('body', 'encoded', 'digest', 'mimetype', 'last_modified', 'mtime', 'cache_control')
+
+    def __init__(self, body, encoded, mimetype, mtime, immutable):
+        self.body = body
+        self.encoded = encoded
+        self.mimetype = mimetype
+        self.mtime = int(mtime)
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.cache_control = IMMUTABLE if immutable else REVALIDATE
+
+    def etag(self, encoding=None):
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def not_modified(self, if_none_match, if_modified_since):
+        """
+        Evaluate conditional request headers; If-None-Match takes precedence over If-Modified-Since
+        """
+        if if_none_match:
+            return etag_matches(if_none_match, self.digest)
+        if if_modified_since:
+            try:
+                return self.mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def negotiate(self, accept_encoding):
+        return negotiate(self.encoded, self.body, accept_encoding)
+
+class StaticManifest:
+    """
+    In-memory index of a built frontend directory, read once at startup so requests
+    never touch the filesystem. Precompressed .gz siblings produced by the build are
+    used when present; otherwise compressible files are compressed while loading.
+    """
+
+    def __init__(self, root, index='index.html'):
+        self.root = root
+        self.assets = {}
+        self.index = None
+        self.load()
+        self.index = self.assets.get(index)
+
+    def load(self):
+        if not os.path.isdir(self.root):
+            print(f"Static directory {self.root} not found; build the frontend with `npx vite build`")
+            return
+
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith('.gz'):
+                    continue
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                try:
+                    self.assets[relative] = self._load_asset(path, relative)
+                except OSError as e:
+                    print(f"Error loading static file {path}: {str(e)}")
+
+    def _load_asset(self, path, relative):
+        with open(path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+        encoded = {}
+        if os.path.exists(path + '.gz'):
+            with open(path + '.gz', 'rb') as f:
+                encoded['gzip'] = f.read()
+        elif len(body) >= MIN_COMPRESS_SIZE and mimetype.startswith(COMPRESSIBLE_TYPES):
+            encoded['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        # Keep only variants that actually save bytes
+        encoded = {encoding: data for encoding, data in encoded.items() if len(data) < len(body)}
+
+        return StaticAsset(body, encoded, mimetype, os.path.getmtime(path), bool(HASHED_NAME.search(relative)))
+
+    def get(self, path):
+        """
+        Return the asset for a URL path, or the index page for client-side routes
+        """
+        return self.assets.get(path) or self.index
@@ -1,47 +1,192 @@
-import yfinance as yf
-from datetime import datetime, timedelta
-import pandas as pd
+import os
+from utils.quote_cache import QuoteCache
+from utils.ticker_index import TickerIndex
+from utils import metrics
+
+PERIODS = {'1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'}
+INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo'}
 
 class StockFetcher:
-    def __init__(self):
-        self.cache = {}
+    def __init__(self, cache=None, ticker_index=None, quote_source=None):
+        # quote_source: the yfinance module or anything with its Ticker() and download(), e.g. a benchmark fake.
+        # yfinance (and pandas with it) is only imported on the first fetch.
+        self._yf = quote_source
         self.cache_timeout = 300  # 5 minutes cache
+        # yfinance keeps its own process-wide keep-alive session; we only bound each request
+        self.request_timeout = float(os.environ.get('YAHOO_TIMEOUT', 10))
+        # Serve quotes up to 2 minutes past expiry while a background refresh runs
+        self.cache = cache if cache is not None else QuoteCache(ttl=self.cache_timeout, stale_grace=120)
+        self.ticker_index = ticker_index if ticker_index is not None else TickerIndex()
+
+    @property
+    def yf(self):
+        if self._yf is None:
+            import yfinance
+
+            self._yf = yfinance
+        return self._yf
 
-    def get_stock_data(self, company_name):
+    def _resolve_ticker(self, company_name):
+        return self.ticker_index.resolve(company_name)
+
+    def get_stock_data(self, company_name, period="1mo", interval="1d"):
         """
-        Get stock data for a company using its ticker symbol
+        Get stock data for a company using its ticker symbol.
+        'history' is a PriceHistory covering period at the given bar interval.
         """
         try:
-            # Simple mapping for demo (in real app, would use a proper company-to-ticker mapping)
-            ticker = company_name.split()[0].upper()
-            
-            # Check cache
-            if ticker in self.cache:
-                timestamp, data = self.cache[ticker]
-                if datetime.now() - timestamp < timedelta(seconds=self.cache_timeout):
-                    return data
+            ticker = self._resolve_ticker(company_name)
+            if ticker is None:
+                return None
 
+            # Cached, stale-while-revalidate, and one fetch per ticker at a time
+            data = self.cache.get_or_load(
+                self._cache_key(ticker, period, interval),
+                lambda: self._fetch_stock_data(ticker, period, interval)
+            )
+            if data is None:
+                metrics.inc('fallbacks_total', operation='get_stock_data')
+            if data is None and not self.ticker_index.is_listed(ticker):
+                # Unlisted symbol that Yahoo doesn't know either; stop retrying it on every view
+                self.ticker_index.add_negative(company_name)
+            return data
+
+        except Exception as e:
+            print(f"Error fetching stock data: {str(e)}")
+            return None
+
+    @staticmethod
+    def _cache_key(ticker, period="1mo", interval="1d"):
+        return f"{ticker}|{period}|{interval}"
+
+    @staticmethod
+    def _batch_key(ticker):
+        return f"{ticker}|batch"
+
+    def _fetch_stock_data(self, ticker, period, interval):
+        # numpy-backed; imported with the first fetch rather than at startup
+        from utils.price_history import PriceHistory
+
+        try:
             # Fetch stock data
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            stock = self.yf.Ticker(ticker)
+            with metrics.timed('upstream_request_seconds', operation='yfinance_info'):
+                info = stock.info
             
             # Get historical data for the chart
-            hist = stock.history(period="1mo")
+            with metrics.timed('upstream_request_seconds', operation='yfinance_history'):
+                hist = stock.history(period=period, interval=interval, timeout=self.request_timeout)
+            if hist.empty and not info.get('regularMarketPrice'):
+                return None
             
-            data = {
+            return {
                 'symbol': ticker,
                 'price': info.get('regularMarketPrice', 0),
                 'change': info.get('regularMarketChange', 0),
                 'change_percent': info.get('regularMarketChangePercent', 0),
                 'volume': info.get('regularMarketVolume', 0),
                 'market_cap': info.get('marketCap', 0),
-                'history': hist['Close'].to_dict() if not hist.empty else {}
+                'history': PriceHistory.from_frame(hist) if not hist.empty else PriceHistory.empty()
             }
-            
-            # Update cache
-            self.cache[ticker] = (datetime.now(), data)
-            return data
 
         except Exception as e:
             print(f"Error fetching stock data: {str(e)}")
             return None
+
+    def get_stock_data_batch(self, companies):
+        """
+        Get stock data for several companies with one bulk download for all uncached tickers.
+        Returns a dict of company name -> stock data (None when unavailable). Full entries cached
+        by get_stock_data are reused; bulk quotes lack market cap, so they are cached under their
+        own key and never stand in for a full entry.
+        """
+        tickers = {company: self._resolve_ticker(company) for company in companies}
+        results = {
+            ticker: self.cache.get(self._cache_key(ticker)) or self.cache.get(self._batch_key(ticker))
+            for ticker in set(tickers.values()) if ticker
+        }
+
+        missing = sorted(ticker for ticker, data in results.items() if data is None)
+        if missing:
+            try:
+                with metrics.timed('upstream_request_seconds', operation='yfinance_download'):
+                    frames = self.yf.download(
+                        missing,
+                        period="1mo",
+                        group_by="ticker",
+                        auto_adjust=False,
+                        progress=False,
+                        timeout=self.request_timeout
+                    )
+                for ticker in missing:
+                    data = self._quote_from_history(ticker, frames)
+                    if data is not None:
+                        self.cache.set(self._batch_key(ticker), data)
+                        results[ticker] = data
+            except Exception as e:
+                print(f"Error fetching batch stock data: {str(e)}")
+
+        return {company: results.get(ticker) for company, ticker in tickers.items()}
+
+    def get_live_quotes(self, tickers):
+        """
+        Fetch current price, change and volume for ticker symbols with one small bulk download,
+        bypassing the cache. Returns a dict of ticker -> quote (None when unavailable),
+        without history or market cap.
+        """
+        try:
+            with metrics.timed('upstream_request_seconds', operation='yfinance_quotes'):
+                frames = self.yf.download(
+                    list(tickers),
+                    period="5d",
+                    group_by="ticker",
+                    auto_adjust=False,
+                    progress=False,
+                    timeout=self.request_timeout
+                )
+        except Exception as e:
+            print(f"Error fetching live quotes: {str(e)}")
+            return {ticker: None for ticker in tickers}
+
+        quotes = {}
+        for ticker in tickers:
+            quote = self._quote_from_history(ticker, frames)
+            if quote is not None:
+                quote = {key: value for key, value in quote.items() if key not in ('history', 'market_cap')}
+                # Round so float noise between polls doesn't count as a change
+                quote.update({key: round(quote[key], 4) for key in ('price', 'change', 'change_percent')})
+            quotes[ticker] = quote
+        return quotes
+
+    def _quote_from_history(self, ticker, frames):
+        """
+        Build a stock data entry from one ticker's slice of a bulk download
+        """
+        import pandas as pd
+        from utils.price_history import PriceHistory
+
+        if isinstance(frames.columns, pd.MultiIndex):
+            if ticker not in frames.columns.get_level_values(0):
+                return None
+            hist = frames[ticker]
+        else:
+            hist = frames
+        hist = hist.dropna(subset=['Close'])
+        if hist.empty:
+            return None
+
+        close = hist['Close']
+        price = float(close.iloc[-1])
+        previous = float(close.iloc[-2]) if len(close) > 1 else price
+        change = price - previous
+        volume = hist['Volume'].iloc[-1] if 'Volume' in hist else 0
+        return {
+            'symbol': ticker,
+            'price': price,
+            'change': change,
+            'change_percent': change / previous * 100 if previous else 0,
+            'volume': int(volume) if pd.notna(volume) else 0,
+            # Not part of the bulk download; filled in by a full get_stock_data fetch
+            'market_cap': 0,
+            'history': PriceHistory.from_frame(hist)
+        }
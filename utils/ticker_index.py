@@ -0,0 +1,131 @@
+import os
+import re
+import csv
+import time
+import bisect
+import threading
+from collections import OrderedDict
+
+DEFAULT_LISTINGS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'listings.csv')
+
+# Legal-form words dropped from the start or end of company names before matching
+NAME_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'companies', 'ltd', 'limited',
+    'plc', 'sa', 'se', 'nv', 'ag', 'a/s', 'holdings', 'holding', 'group', '&', 'and'
+}
+NAME_PREFIXES = {'the'}
+
+# Input typed as a ticker symbol, e.g. "PLTR" or "BRK-B"
+SYMBOL_PATTERN = re.compile(r'^[A-Z][A-Z0-9]{0,4}([.\-][A-Z])?$')
+
+# Shorter queries are too ambiguous to resolve by name prefix ("a" -> Apple, "Co" -> Costco)
+MIN_PREFIX_LENGTH = 3
+# Common words that start many company names; on their own they never resolve by prefix
+GENERIC_WORDS = {
+    'american', 'bank', 'capital', 'energy', 'financial', 'first', 'general', 'global',
+    'health', 'international', 'national', 'systems', 'technologies', 'united'
+}
+
+class TickerIndex:
+    """
+    In-memory company name -> ticker index built from a bundled listing file.
+    Resolves exact symbols, exact names and aliases through dicts, passes other ticker-shaped
+    input through, and resolves name prefixes of at least MIN_PREFIX_LENGTH characters
+    through binary search over a sorted key array. Misses are cached for negative_ttl seconds.
+    """
+
+    def __init__(self, path=DEFAULT_LISTINGS_PATH, max_prefix_candidates=50,
+                 negative_ttl=3600, max_negative_entries=1024):
+        self.max_prefix_candidates = max_prefix_candidates
+        self.negative_ttl = negative_ttl
+        self.max_negative_entries = max_negative_entries
+        self.negative = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.symbols = {}
+        self.names = {}
+        with open(path, newline='') as f:
+            for rank, row in enumerate(csv.DictReader(f)):
+                symbol = row['symbol'].strip().upper()
+                self.symbols[symbol] = rank
+                for name in [row['name']] + (row.get('aliases') or '').split('|'):
+                    key = self.normalize(name)
+                    if key and key not in self.names:
+                        self.names[key] = (rank, symbol)
+
+        # Sorted parallel arrays for prefix search
+        entries = sorted(self.names.items())
+        self.keys = [key for key, _ in entries]
+        self.values = [value for _, value in entries]
+
+    @staticmethod
+    def normalize(name):
+        name = name.lower().replace("'", '').replace('.', '').replace(',', '').replace('-', ' ')
+        words = name.split()
+        while words and words[0] in NAME_PREFIXES:
+            words.pop(0)
+        while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+            words.pop()
+        return ' '.join(words)
+
+    def resolve(self, query):
+        """
+        Return the ticker symbol for a company name, alias or symbol, or None if unknown
+        """
+        if not query or not query.strip():
+            return None
+        query = query.strip()
+        key = self.normalize(query)
+
+        if self._is_negative(key):
+            return None
+
+        # Exact name or alias, then exact symbol in any case
+        if key in self.names:
+            return self.names[key][1]
+        if query.upper() in self.symbols:
+            return query.upper()
+
+        # Not listed, but typed like a ticker (e.g. "AI"): let the quote source decide rather
+        # than guess a company whose name starts with those letters
+        if SYMBOL_PATTERN.match(query):
+            return query
+
+        # Best-ranked listing whose name starts with the query
+        if len(key) >= MIN_PREFIX_LENGTH and key not in GENERIC_WORDS:
+            start = bisect.bisect_left(self.keys, key)
+            best = None
+            for index in range(start, min(start + self.max_prefix_candidates, len(self.keys))):
+                if not self.keys[index].startswith(key):
+                    break
+                if best is None or self.values[index][0] < best[0]:
+                    best = self.values[index]
+            if best is not None:
+                return best[1]
+
+        self.add_negative(query)
+        return None
+
+    def is_listed(self, symbol):
+        return symbol in self.symbols
+
+    def add_negative(self, query):
+        """
+        Remember that a query does not resolve to a usable ticker
+        """
+        with self.lock:
+            key = self.normalize(query)
+            self.negative[key] = time.monotonic()
+            self.negative.move_to_end(key)
+            while len(self.negative) > self.max_negative_entries:
+                self.negative.popitem(last=False)
+
+    def _is_negative(self, key):
+        with self.lock:
+            added = self.negative.get(key)
+            if added is None:
+                return False
+            if time.monotonic() - added < self.negative_ttl:
+                return True
+            del self.negative[key]
+            return False